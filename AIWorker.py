@@ -0,0 +1,70 @@
+import threading
+import time
+
+
+class AIWorker:
+    """Runs one AI search at a time on a background thread so the GUI keeps drawing.
+
+    The search function is called with stop_event and on_progress keyword
+    arguments. It reports (depth, value, move) through on_progress as it
+    improves, and must return early once stop_event is set. If it raises, the
+    exception is re-raised by take_result on the calling (GUI) thread instead of
+    being handed back as a None move, which the game would take for a pass.
+    """
+
+    def __init__(self):
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.result = None
+        self.error = None  # exception raised by the search, re-raised by take_result
+        self.progress = None  # latest (depth, value, move) reported by the search
+        self.done = False
+        self.started = None  # time.time() when the search started
+
+    def start(self, search, *args, **kwargs):
+        """Start search(*args, **kwargs) on a new thread."""
+        self.stop_event = threading.Event()
+        self.result = None
+        self.error = None
+        self.progress = None
+        self.done = False
+        self.started = time.time()
+
+        def run():
+            try:
+                self.result = search(*args, stop_event=self.stop_event, on_progress=self.report, **kwargs)
+            except Exception as error:
+                self.error = error
+            finally:
+                self.done = True
+
+        self.thread = threading.Thread(target=run, daemon=True)
+        self.thread.start()
+
+    def report(self, depth, value, move):
+        self.progress = (depth, value, move)
+
+    @property
+    def idle(self):
+        """True when no search is running and no result is waiting to be taken."""
+        return self.thread is None
+
+    def take_result(self):
+        """Return the finished search's result and free the worker for the next search.
+
+        Raises:
+            Exception: Whatever the search raised, with its original traceback
+        """
+        self.thread.join()
+        self.thread = None
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+        return self.result
+
+    def cancel(self, timeout=1.0):
+        """Ask the running search to stop and wait (up to timeout seconds) for it."""
+        if self.thread is not None:
+            self.stop_event.set()
+            self.thread.join(timeout)
+            self.thread = None
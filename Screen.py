@@ -1,10 +1,13 @@
 import pygame
+import os
 import sys
 import time
-from GameState import GameState
 from GameConstants import width, center_pos
-from minimax import minimax
-from MonteCarlo import montecarlo
+from AIWorker import AIWorker
+from engine import (GameState, MCTSEngine, MoveOrderer, ParallelMinimax, SearchContext, TranspositionTable,
+                    iterative_deepening, minimax)
+from engine.Difficulty import MINIMAX_DIFFICULTY, MONTECARLO_DIFFICULTY
+from engine.OpeningBook import DEFAULT_BOOK_PATH, OpeningBook
 
 
 state = GameState()
@@ -14,6 +17,19 @@ pygame.display.set_caption("Yonmoque-Hex Game")
 font_small = pygame.font.Font(None, 32)
 font_large = pygame.font.Font(None, 48)
 
+# MCTS engines of the current game, keyed by (ai_color, rollout depth); they keep their tree between turns
+mcts_engines = {}
+
+# Worker pools of the current game's parallel searches, started on first use and shut down with the game
+search_pools = {}
+
+# AI turns run on this background worker so the window keeps refreshing while the computer thinks
+ai_worker = AIWorker()
+frame_clock = pygame.time.Clock()
+
+# Precomputed answers for the first placements (built with `python -m engine.OpeningBook`)
+opening_book = OpeningBook(DEFAULT_BOOK_PATH) if os.path.exists(DEFAULT_BOOK_PATH) else None
+
 # Hexagonal board tile configuration (position and color)
 # Tile positions and colors defined in a 5x5 grid
     # Format: (x,y): {"color": <color>, "pos": (calculated_position)}
@@ -347,31 +363,116 @@ def drawPieces():
         pygame.draw.circle(screen, piece[1], pos, width / 4)
         pygame.draw.circle(screen, "black", pos, width / 4, 1)
 
-def getComputerMoveMinimax(depth, ai_color="white"):
-    """Get AI move using Minimax algorithm"""
+def getBookMove(state):
+    """Opening book move for state, or None if there is no book or the position is not in it"""
+    if opening_book is None:
+        return None
+    entry = opening_book.probe(state)
+    if entry is None:
+        return None
+    print("Opening book move:", entry[0])
+    return entry[0]
+
+
+def getSearchPool(kind, workers):
+    """Worker pool of the current game for a kind of parallel search ("minimax"), started on first use"""
+    pool = search_pools.get(kind)
+    if pool is None:
+        pool = search_pools[kind] = ParallelMinimax(workers)
+    return pool
+
+
+def closeSearchPools():
+    """Shut the current game's worker pools down without waiting for the searches running in them"""
+    for pool in search_pools.values():
+        pool.close(wait=False)
+    search_pools.clear()
+
+
+def getComputerMoveMinimax(depth, ai_color="white", time_budget_ms=None, workers=1, stop_event=None,
+                           on_progress=None):
+    """Get AI move using Minimax algorithm
+        With a time budget, iterative deepening searches up to depth within it,
+        splitting the root moves over worker processes when workers > 1.
+        stop_event and on_progress(depth, value, move) let a background worker
+        stop the search and follow its iterations"""
+    book_move = getBookMove(state)
+    if book_move is not None:
+        return book_move
+
+    if time_budget_ms is not None:
+        if workers > 1:
+            best_value, best_move, reached_depth = iterative_deepening(
+                state, time_budget_ms, ai_color, max_depth=depth, on_iteration=on_progress,
+                parallel=getSearchPool("minimax", workers), stop_event=stop_event)
+        else:
+            best_value, best_move, reached_depth = iterative_deepening(
+                state, time_budget_ms, ai_color, max_depth=depth, on_iteration=on_progress,
+                stop_event=stop_event)
+        print(f"Computer's best move: {best_move} (depth {reached_depth})")
+        return best_move
+
     best_value, best_move = minimax(
-        state,
+        state.copy_state(),  # searched in place, and the GUI may be drawing state meanwhile
         depth=depth,  # Set appropriate depth for the AI
         alpha=float('-inf'),
         beta=float('inf'),
         maximizing_player=True,  # The computer (AI) plays as "white"
         last_play=None,
-        ai_color=ai_color
+        ai_color=ai_color,
+        context=SearchContext(TranspositionTable(), orderer=MoveOrderer(), stop_event=stop_event)
     )
     print("Computer's best move:", best_move)
     return best_move
 
 
-def getComputerMoveMonteCarlo(state, depth, ai_color, num_simulations=250):
-    best_move = montecarlo(
-        state=state,
-        rollout_depth=depth,
-        num_simulations=num_simulations,
-        ai_color=ai_color,
-    )
+def getComputerMoveMonteCarlo(state, depth, ai_color, num_simulations=250, stop_event=None, on_progress=None):
+    """Get AI move using Monte Carlo Tree Search
+        Searches go through a persistent MCTSEngine per (color, rollout depth),
+        so the tree is reused from one turn to the next.
+        stop_event lets a background worker stop the search (MCTS reports no progress)"""
+    book_move = getBookMove(state)
+    if book_move is not None:
+        return book_move
+
+    engine = mcts_engines.get((ai_color, depth))
+    if engine is None:
+        engine = mcts_engines[(ai_color, depth)] = MCTSEngine(depth, ai_color)
+    best_move = engine.choose_move(state, num_simulations, stop_event=stop_event)
     print("Monte Carlo best move:", best_move)
     return best_move
 
+
+def drawThinking():
+    """Show that the computer is thinking, with the search's progress so far"""
+    text = f"Computer is thinking... {time.time() - ai_worker.started:.1f}s"
+    if ai_worker.progress is not None:
+        depth, value, move = ai_worker.progress
+        text += f"  depth {depth}, best {move}"
+    draw_text(text, (400, 670), font_small)
+
+
+def runAITurn(search, *args, **kwargs):
+    """Run an AI search on the background worker without blocking the window.
+        Call once per frame: the first call starts the search, and every call
+        handles events and draws the thinking indicator.
+        Returns:
+            bool: True when the search is done (its move is ai_worker.take_result())"""
+    if ai_worker.idle:
+        ai_worker.start(search, *args, **kwargs)
+    for event in pygame.event.get():
+        if event.type == pygame.QUIT:
+            ai_worker.cancel()
+            closeSearchPools()
+            pygame.quit()
+            sys.exit()
+    if ai_worker.done:
+        return True
+    drawThinking()
+    pygame.display.flip()
+    frame_clock.tick(30)
+    return False
+
 def game_loop(mode, AIMode, difficulty=None, num_simulations=None):
     """Main game loop handling different play modes
         Args:
@@ -381,7 +482,10 @@ def game_loop(mode, AIMode, difficulty=None, num_simulations=None):
             num_simulations: Number of MCTS simulations
         """
     global state
+    ai_worker.cancel()
+    closeSearchPools()
     state.reset()
+    mcts_engines.clear()
     selected_piece = None  # selected piece to move (if is not None, selected_outside must be)
     selected_tile = None  # selected tile to place or move
     selected_outside = None  # if it is selected outside (to place)
@@ -499,12 +603,7 @@ def game_loop(mode, AIMode, difficulty=None, num_simulations=None):
 
     if mode == "pvc":
         if AIMode=="minimax":
-            if difficulty == "easy":
-                depth = 2
-            elif difficulty == "intermediate":
-                depth = 3
-            else:
-                depth = 4
+            depth, time_budget_ms, workers = MINIMAX_DIFFICULTY.get(difficulty, MINIMAX_DIFFICULTY["hard"])
             while True:
 
                 screen.fill("lightgoldenrod")
@@ -610,10 +709,11 @@ def game_loop(mode, AIMode, difficulty=None, num_simulations=None):
 
 
                 elif state.current_player == "white":
-                    print("I can get here")
-                    start_time = time.time()
-                    best_move = getComputerMoveMinimax(depth=depth)
-                    move_time=time.time()-start_time
+                    if not runAITurn(getComputerMoveMinimax, depth=depth, time_budget_ms=time_budget_ms,
+                                     workers=workers):
+                        continue
+                    move_time = time.time() - ai_worker.started
+                    best_move = ai_worker.take_result()
                     ai_times.append(move_time)
                     print(f"Minimax with difficulty {difficulty}: {move_time}")
                     if best_move is not None:
@@ -643,12 +743,8 @@ def game_loop(mode, AIMode, difficulty=None, num_simulations=None):
                                 return
 
         if AIMode=="montecarlo":
-            if difficulty == "easy":
-                depth = 3
-            elif difficulty == "intermediate":
-                depth = 5
-            else:
-                depth = 8
+            depth, default_simulations = MONTECARLO_DIFFICULTY.get(difficulty, MONTECARLO_DIFFICULTY["hard"])
+            num_simulations = num_simulations or default_simulations
             while True:
                 screen.fill("lightgoldenrod")
                 drawBoard(state.current_player)
@@ -768,10 +864,11 @@ def game_loop(mode, AIMode, difficulty=None, num_simulations=None):
                         last_play_was_move = False
 
                 elif state.current_player == "white":
-                    print("I can get here")
-                    start_time = time.time()
-                    best_move = getComputerMoveMonteCarlo(state, depth= depth, ai_color="white", num_simulations=num_simulations)
-                    move_time = time.time() - start_time
+                    if not runAITurn(getComputerMoveMonteCarlo, state, depth=depth, ai_color="white",
+                                     num_simulations=num_simulations):
+                        continue
+                    move_time = time.time() - ai_worker.started
+                    best_move = ai_worker.take_result()
                     ai_times.append(move_time)
                     print(f"Montecarlo with difficulty {difficulty}: {move_time}")
                     if best_move is not None:
@@ -810,9 +907,9 @@ def game_loop(mode, AIMode, difficulty=None, num_simulations=None):
             pygame.display.flip()
 
             if state.current_player == "black":
-                print("I can get here")
-
-                best_move = getComputerMoveMinimax(depth=4, ai_color="black")
+                if not runAITurn(getComputerMoveMinimax, depth=4, ai_color="black"):
+                    continue
+                best_move = ai_worker.take_result()
 
                 if best_move is not None:
                     if best_move[0] == "place":
@@ -838,9 +935,9 @@ def game_loop(mode, AIMode, difficulty=None, num_simulations=None):
 
 
             elif state.current_player == "white":
-                print("I can get here")
-
-                best_move = getComputerMoveMonteCarlo(state, depth=7, ai_color="white")
+                if not runAITurn(getComputerMoveMonteCarlo, state, depth=7, ai_color="white"):
+                    continue
+                best_move = ai_worker.take_result()
 
                 if best_move is not None:
                     if best_move[0] == "place":
@@ -0,0 +1,264 @@
+"""Headless engine-vs-engine arena.
+
+Run with `python arena.py --a minimax:difficulty=hard --b montecarlo:difficulty=hard --games 1000`.
+
+Every opening (a few random placements) is played twice with the colors
+swapped, so neither engine profits from a lucky opening or from moving first.
+Games run in parallel in a process pool. The report gives the win/loss/draw
+tally of engine A, its Elo difference to B with a 95% confidence interval,
+and per-move timings for both engines. The interval is the Wilson interval of
+the score with draws counted as half a win.
+
+Engine specs are `name[:key=value,...]`:
+    minimax:     difficulty, max_depth, time_ms
+    montecarlo:  difficulty, simulations, rollout_depth, policy
+    random
+where difficulty fills in the levels of engine.Difficulty and the other keys
+override them.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from engine import GameState, MCTSEngine, iterative_deepening
+from engine.Difficulty import MINIMAX_DIFFICULTY, MONTECARLO_DIFFICULTY
+from engine.GameRecord import write_games
+
+DEFAULT_MAX_PLIES = 200
+Z_95 = 1.959964
+
+
+def parse_spec(spec):
+    """"montecarlo:simulations=200,policy=winblock" -> ("montecarlo", {"simulations": 200, "policy": "winblock"})"""
+    name, _, options = spec.partition(":")
+    parsed = {}
+    for option in filter(None, options.split(",")):
+        key, _, value = option.partition("=")
+        parsed[key] = int(value) if value.lstrip("-").isdigit() else value
+    if name not in ("minimax", "montecarlo", "random"):
+        raise ValueError(f"Unknown engine: {name}")
+    return name, parsed
+
+
+def make_player(spec, color, seed):
+    """Build a move function for one side of one game.
+
+    Returns:
+        callable: player(state) -> move
+    """
+    name, options = parse_spec(spec)
+    if name == "random":
+        rng = random.Random(seed)
+        return lambda state: rng.choice(state.get_valid_plays())
+
+    if name == "minimax":
+        max_depth, time_ms, _ = MINIMAX_DIFFICULTY[options.get("difficulty", "intermediate")]
+        max_depth = options.get("max_depth", max_depth)
+        time_ms = options.get("time_ms", time_ms)
+        return lambda state: iterative_deepening(state, time_ms, color, max_depth=max_depth)[1]
+
+    rollout_depth, simulations = MONTECARLO_DIFFICULTY[options.get("difficulty", "intermediate")]
+    engine = MCTSEngine(options.get("rollout_depth", rollout_depth), color,
+                        rollout_policy=options.get("policy", "heuristic"), seed=seed)
+    simulations = options.get("simulations", simulations)
+    return lambda state: engine.choose_move(state, simulations)
+
+
+def random_opening(plies, rng):
+    """A list of up to `plies` random placements (never one that ends the game)."""
+    state = GameState()
+    opening = []
+    for _ in range(plies):
+        placements = [move for move in state.get_valid_plays() if move[0] == "place"]
+        rng.shuffle(placements)
+        for move in placements:
+            undo_token = state.apply(move)
+            if not state.is_game_over(move):
+                opening.append(move)
+                break
+            state.undo(undo_token)
+        else:
+            break
+    return opening
+
+
+def play_game(black_spec, white_spec, opening, seed, max_plies=DEFAULT_MAX_PLIES):
+    """Worker task: play one game from an opening.
+
+    A game that reaches max_plies, or whose side to move has no legal move, is a draw.
+
+    Returns:
+        dict: "winner" ("black", "white" or None), "plies", "moves" (opening
+        included) and the per-move "times" in seconds of each color
+    """
+    players = {"black": make_player(black_spec, "black", seed), "white": make_player(white_spec, "white", seed + 1)}
+    times = {"black": [], "white": []}
+    state = GameState()
+    moves = list(opening)
+    for move in opening:
+        state.apply(move)
+
+    winner = None
+    plies = len(opening)
+    while plies < max_plies:
+        player = state.current_player
+        if not state.get_valid_plays():
+            break
+        started = time.perf_counter()
+        move = players[player](state.copy_state())
+        times[player].append(time.perf_counter() - started)
+        state.apply(move)
+        moves.append(move)
+        plies += 1
+        if state.is_game_over(move):
+            # Same order as the GUI: a five-in-a-row loss outranks a four-in-a-row win
+            loser = state.check_lose()
+            if loser is not None:
+                winner = "white" if loser == "black" else "black"
+            else:
+                winner = state.check_win(move)
+            break
+    return {"winner": winner, "plies": plies, "moves": moves, "times": times}
+
+
+def elo_difference(score):
+    """Elo difference implied by an expected score in (0, 1)."""
+    return -400 * math.log10(1 / score - 1)
+
+
+def summarize(results, a_colors):
+    """Tally the games from engine A's point of view.
+
+    Args:
+        results: play_game results
+        a_colors: Color engine A played in each result
+
+    Returns:
+        dict: Tally, score, Elo with its 95% interval, and move timings per engine
+    """
+    wins = losses = draws = 0
+    points = []
+    times = {"a": [], "b": []}
+    for result, a_color in zip(results, a_colors):
+        b_color = "white" if a_color == "black" else "black"
+        if result["winner"] is None:
+            draws += 1
+            points.append(0.5)
+        elif result["winner"] == a_color:
+            wins += 1
+            points.append(1.0)
+        else:
+            losses += 1
+            points.append(0.0)
+        times["a"].extend(result["times"][a_color])
+        times["b"].extend(result["times"][b_color])
+
+    games = len(points)
+    score = sum(points) / games
+    # Wilson interval of the score (draws count as half a win), which stays
+    # meaningful for one-sided results where the normal approximation collapses
+    z2 = Z_95 * Z_95
+    center = (score + z2 / (2 * games)) / (1 + z2 / games)
+    margin = Z_95 * math.sqrt(score * (1 - score) / games + z2 / (4 * games * games)) / (1 + z2 / games)
+
+    def elo(value):
+        # A score of 0 or 1 has no finite Elo; clamp to half a game either way
+        limit = 0.5 / games
+        return elo_difference(min(max(value, limit), 1 - limit))
+
+    return {
+        "games": games,
+        "wins": wins,
+        "losses": losses,
+        "draws": draws,
+        "score": score,
+        "elo": elo(score),
+        "elo_low": elo(center - margin),
+        "elo_high": elo(center + margin),
+        "mean_plies": sum(result["plies"] for result in results) / games,
+        "move_times": {side: timing_summary(side_times) for side, side_times in times.items()},
+    }
+
+
+def timing_summary(times):
+    """Mean, nearest-rank percentiles and maximum of a list of move times."""
+    if not times:
+        return None
+    ordered = sorted(times)
+
+    def percentile(fraction):
+        return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+    return {
+        "moves": len(ordered),
+        "mean": sum(ordered) / len(ordered),
+        "p50": percentile(0.5),
+        "p90": percentile(0.9),
+        "max": ordered[-1],
+    }
+
+
+def run_match(a_spec, b_spec, games, opening_plies=2, workers=None, seed=0, max_plies=DEFAULT_MAX_PLIES,
+              record_path=None):
+    """Play games (rounded up to an even number) between two engines.
+
+    With record_path, the games are also appended to that game record file
+    (see engine.GameRecord).
+
+    Returns:
+        dict: The summary of summarize, plus the match settings
+    """
+    rng = random.Random(seed)
+    tasks = []
+    for _ in range((games + 1) // 2):
+        opening = random_opening(opening_plies, rng)
+        game_seed = rng.randrange(1 << 30)
+        tasks.append((a_spec, b_spec, opening, game_seed, "black"))
+        tasks.append((b_spec, a_spec, opening, game_seed, "white"))
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+        results = list(executor.map(
+            play_game, [task[0] for task in tasks], [task[1] for task in tasks], [task[2] for task in tasks],
+            [task[3] for task in tasks], [max_plies] * len(tasks), chunksize=max(1, len(tasks) // 64)))
+
+    if record_path is not None:
+        write_games(record_path, ((result["moves"], result["winner"]) for result in results))
+
+    summary = summarize(results, [task[4] for task in tasks])
+    summary.update(a=a_spec, b=b_spec, opening_plies=opening_plies, seed=seed, max_plies=max_plies)
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Yonmoque-Hex engine-vs-engine arena")
+    parser.add_argument("--a", required=True, help="engine spec of the engine under test")
+    parser.add_argument("--b", required=True, help="engine spec of the reference engine")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--opening-plies", type=int, default=2, help="random placements before the engines play")
+    parser.add_argument("--max-plies", type=int, default=DEFAULT_MAX_PLIES, help="game length scored as a draw")
+    parser.add_argument("--workers", type=int, default=None, help="game processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the summary as JSON to this file")
+    parser.add_argument("--record", help="append the games to this game record file")
+    args = parser.parse_args()
+
+    parse_spec(args.a)
+    parse_spec(args.b)
+    summary = run_match(args.a, args.b, args.games, args.opening_plies, args.workers, args.seed, args.max_plies,
+                        args.record)
+    print(f"{args.a} vs {args.b}: +{summary['wins']} -{summary['losses']} ={summary['draws']} "
+          f"in {summary['games']} games, score {summary['score']:.3f}")
+    print(f"Elo {summary['elo']:+.0f} (95% CI {summary['elo_low']:+.0f} to {summary['elo_high']:+.0f}), "
+          f"{summary['mean_plies']:.1f} plies per game")
+    for side, spec in (("a", args.a), ("b", args.b)):
+        timing = summary["move_times"][side]
+        if timing is not None:
+            print(f"{spec}: {timing['moves']} moves, mean {timing['mean'] * 1000:.1f} ms, "
+                  f"p90 {timing['p90'] * 1000:.1f} ms, max {timing['max'] * 1000:.1f} ms")
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(summary, output_file, indent=1)
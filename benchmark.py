@@ -0,0 +1,301 @@
+"""Headless benchmark of the search engines over a fixed corpus of positions.
+
+Run with `python benchmark.py [--engines minimax montecarlo] [--difficulties easy hard]`.
+
+Every engine is run at every difficulty level of engine.Difficulty on each
+position of benchmarks/positions.json (opening, midgame and endgame). The
+report gives time-to-move percentiles, nodes/sec or rollouts/sec, search depth,
+effective branching factor and the memory peak of one representative search.
+
+    --output FILE     write the report as JSON (e.g. a new benchmarks/baseline.json)
+    --compare FILE    compare with a stored report; exits with status 1 on a regression
+                      (exits with status 2 if its worker counts need more CPUs than this machine has)
+    --repeat N        search each position N times and keep the fastest (default 3)
+    --make-corpus     regenerate the position corpus from seeded random games
+
+Time-budgeted minimax searches always take about their budget, so they are
+compared on nodes/sec; the other configurations are compared on their time to
+move. The memory peak is measured with tracemalloc in this process only, so it
+leaves out the worker processes of parallel configurations.
+
+Hard minimax searches with one worker per CPU, so each result records its
+worker count and --compare reruns every configuration with the worker count of
+the stored report rather than that of this machine.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from engine import GameState, ParallelMinimax, SearchStats, iterative_deepening, montecarlo
+from engine.Difficulty import MINIMAX_DIFFICULTY, MONTECARLO_DIFFICULTY
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "positions.json")
+CORPUS_SEED = 2024
+PHASES = ("opening", "midgame", "endgame")
+ENGINES = ("minimax", "montecarlo")
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_REPEAT = 3
+
+
+def position_phase(state):
+    """opening: up to 4 pieces on the board, endgame: both reserves empty, midgame: in between."""
+    if not any(state.reserve.values()):
+        return "endgame"
+    return "opening" if len(state.pieces) <= 4 else "midgame"
+
+
+def make_corpus(per_phase=4, seed=CORPUS_SEED):
+    """Sample positions from seeded random games, per_phase of each phase.
+
+    Moves that end the game are avoided so the games reach the endgame, and
+    only positions with a legal move are kept.
+
+    Returns:
+        list: [{"name": ..., "phase": ..., "position": GameState.to_dict()}, ...]
+    """
+    rng = random.Random(seed)
+    corpus = []
+    counts = dict.fromkeys(PHASES, 0)
+    while min(counts.values()) < per_phase:
+        state = GameState()
+        for _ in range(rng.randrange(2, 40)):
+            moves = state.get_valid_plays()
+            rng.shuffle(moves)
+            for move in moves:
+                undo_token = state.apply(move)
+                if not state.is_game_over(move):
+                    break
+                state.undo(undo_token)
+            else:
+                break  # every move ends the game
+        phase = position_phase(state)
+        if counts[phase] < per_phase and state.get_valid_plays():
+            counts[phase] += 1
+            corpus.append({"name": f"{phase}-{counts[phase]}", "phase": phase, "position": state.to_dict()})
+    return sorted(corpus, key=lambda entry: (PHASES.index(entry["phase"]), entry["name"]))
+
+
+def load_corpus(path=CORPUS_PATH):
+    with open(path) as corpus_file:
+        return json.load(corpus_file)
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def search(engine, difficulty, state, seed, stats, parallel=None):
+    """Pick a move for state as the GUI would at this difficulty, recording into stats."""
+    if engine == "minimax":
+        depth, time_budget_ms, _ = MINIMAX_DIFFICULTY[difficulty]
+        return iterative_deepening(state, time_budget_ms, state.current_player, max_depth=depth,
+                                   parallel=parallel, stats=stats)[1]
+    rollout_depth, num_simulations = MONTECARLO_DIFFICULTY[difficulty]
+    return montecarlo(state, num_simulations, rollout_depth, state.current_player, seed=seed, stats=stats)
+
+
+def default_workers(engine, difficulty):
+    """Worker processes the GUI would search with: minimax per engine.Difficulty, MCTS always 1."""
+    return MINIMAX_DIFFICULTY[difficulty][2] if engine == "minimax" else 1
+
+
+def run_config(engine, difficulty, corpus, repeat=DEFAULT_REPEAT, workers=None):
+    """Benchmark one engine at one difficulty over the corpus.
+
+    Each position is searched repeat times and only the fastest search counts,
+    which keeps the numbers steady enough to compare against a baseline.
+
+    Args:
+        workers: Worker processes for minimax, None for the difficulty's own count
+
+    Returns:
+        dict: Summary metrics plus the per-position times and depths
+    """
+    if workers is None:
+        workers = default_workers(engine, difficulty)
+    parallel = ParallelMinimax(workers) if workers > 1 else None
+    try:
+        positions = []
+        total = SearchStats()
+        for seed, entry in enumerate(corpus):
+            seconds = None
+            for _ in range(repeat):
+                state = GameState.from_dict(entry["position"])
+                run_stats = SearchStats()
+                started = time.perf_counter()
+                run_move = search(engine, difficulty, state, seed, run_stats, parallel)
+                run_seconds = time.perf_counter() - started
+                if seconds is None or run_seconds < seconds:
+                    seconds, move, stats = run_seconds, run_move, run_stats
+            total.merge(stats)
+            total.elapsed += stats.elapsed
+            positions.append({
+                "name": entry["name"],
+                "seconds": seconds,
+                "move": None if move is None else [move[0]] + [list(tile) for tile in move[1:]],
+                "depth": stats.depth if engine == "minimax" else stats.max_tree_depth,
+                "effective_branching_factor": stats.effective_branching_factor,
+            })
+
+        # Memory: search a representative (the first midgame) position again under tracemalloc
+        representative = next((entry for entry in corpus if entry["phase"] == "midgame"), corpus[0])
+        tracemalloc.start()
+        try:
+            search(engine, difficulty, GameState.from_dict(representative["position"]), 0, SearchStats(), parallel)
+            memory_peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    finally:
+        if parallel is not None:
+            parallel.close()
+
+    times = [position["seconds"] for position in positions]
+    branching = [position["effective_branching_factor"] for position in positions
+                 if position["effective_branching_factor"] is not None]
+    return {
+        "engine": engine,
+        "difficulty": difficulty,
+        "workers": workers,
+        "time_budgeted": engine == "minimax",
+        "time_p50": percentile(times, 0.5),
+        "time_p90": percentile(times, 0.9),
+        "time_max": max(times),
+        "time_mean": sum(times) / len(times),
+        "nodes_per_second": total.nodes_per_second if engine == "minimax" else None,
+        "rollouts_per_second": total.rollouts_per_second if engine == "montecarlo" else None,
+        "mean_depth": sum(position["depth"] for position in positions) / len(positions),
+        "mean_effective_branching_factor": sum(branching) / len(branching) if branching else None,
+        "memory_peak_bytes": memory_peak,
+        "positions": positions,
+    }
+
+
+def run(engines, difficulties, corpus, repeat=DEFAULT_REPEAT, workers=None):
+    """Benchmark every (engine, difficulty) pair and return the JSON report.
+
+    Args:
+        workers: Optional {"engine/difficulty": worker count} overriding the default counts
+    """
+    workers = workers or {}
+    results = {}
+    for engine in engines:
+        for difficulty in difficulties:
+            key = f"{engine}/{difficulty}"
+            results[key] = run_config(engine, difficulty, corpus, repeat, workers.get(key))
+            print_result(results[key])
+    return {
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "cpus": os.cpu_count()},
+        "corpus_size": len(corpus),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def print_result(result):
+    rate = (f"{result['nodes_per_second']:.0f} nodes/s" if result["time_budgeted"]
+            else f"{result['rollouts_per_second']:.0f} rollouts/s")
+    print(f"{result['engine'] + '/' + result['difficulty']:<24} p50 {result['time_p50']:.3f}s  "
+          f"p90 {result['time_p90']:.3f}s  max {result['time_max']:.3f}s  {rate}  "
+          f"depth {result['mean_depth']:.1f}  peak {result['memory_peak_bytes'] / 1e6:.1f} MB", flush=True)
+
+
+def baseline_workers(baseline):
+    """Worker count of every configuration of a stored report, to rerun them the same way.
+
+    Raises:
+        ValueError: If a result has no worker count (a report from before they were recorded)
+    """
+    workers = {}
+    for key, result in baseline["results"].items():
+        if "workers" not in result:
+            raise ValueError(f"{key} has no recorded worker count; record the baseline again")
+        workers[key] = result["workers"]
+    return workers
+
+
+def compare(baseline, report, tolerance=DEFAULT_TOLERANCE):
+    """List the regressions of report against baseline beyond a relative tolerance.
+
+    A configuration searched with a different worker count than the baseline is
+    reported as not comparable instead of being checked.
+
+    Returns:
+        list: Human-readable regression messages (empty if there are none)
+    """
+    regressions = []
+    for key, result in report["results"].items():
+        base = baseline["results"].get(key)
+        if base is None:
+            continue
+        if base.get("workers") != result["workers"]:
+            regressions.append(f"{key}: searched with {result['workers']} workers, baseline with "
+                               f"{base.get('workers')}; not comparable")
+            continue
+        if result["time_budgeted"]:
+            checks = [("nodes_per_second", True), ("mean_depth", True)]
+        else:
+            checks = [("time_mean", False), ("rollouts_per_second", True)]
+        checks.append(("memory_peak_bytes", False))
+        for metric, higher_is_better in checks:
+            old, new = base.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (change < -tolerance) if higher_is_better else (change > tolerance):
+                regressions.append(f"{key} {metric}: {old:.4g} -> {new:.4g} ({change:+.0%})")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Yonmoque-Hex engine benchmark")
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=list(ENGINES))
+    parser.add_argument("--difficulties", nargs="+", choices=list(MINIMAX_DIFFICULTY),
+                        default=list(MINIMAX_DIFFICULTY))
+    parser.add_argument("--corpus", default=CORPUS_PATH)
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="baseline JSON report to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="relative change allowed before a metric counts as a regression")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="searches per position, the fastest of which counts")
+    parser.add_argument("--make-corpus", action="store_true", help="regenerate the corpus file and exit")
+    args = parser.parse_args()
+
+    if args.make_corpus:
+        os.makedirs(os.path.dirname(os.path.abspath(args.corpus)), exist_ok=True)
+        with open(args.corpus, "w") as corpus_file:
+            json.dump(make_corpus(), corpus_file, indent=1)
+        sys.exit(0)
+
+    baseline, workers = None, None
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        try:
+            workers = baseline_workers(baseline)
+            cpus = os.cpu_count() or 1
+            too_many = sorted(key for key, count in workers.items() if count > cpus)
+            if too_many:
+                raise ValueError(f"{', '.join(too_many)} used more workers than the {cpus} CPUs of this machine")
+        except ValueError as error:
+            print(f"cannot compare with {args.compare}: {error}", file=sys.stderr)
+            sys.exit(2)
+
+    report = run(args.engines, args.difficulties, load_corpus(args.corpus), args.repeat, workers)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=1)
+    if baseline is not None:
+        regressions = compare(baseline, report, args.tolerance)
+        for regression in regressions:
+            print("REGRESSION", regression)
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,229 @@
+"""Vectorized rules for many positions at once (requires NumPy).
+
+Positions are encoded as rows of arrays instead of GameState objects:
+    boards:   (N, 25) int8, tile i = BOARD_TILES[i] holds EMPTY, BLACK or WHITE
+    reserves: (N, 2) int, pieces left to place for black and white
+    players:  (N,) int, BLACK_TO_MOVE or WHITE_TO_MOVE
+
+Every function handles the whole batch with array operations over tables
+precomputed from BoardGeometry, so the per-state cost is a few array
+elements instead of Python loops over rays.
+"""
+import numpy as np
+
+from .BoardGeometry import AXIS_LINES, BOARD_TILES, LINES_4, LINES_5, RAYS, TILE_AXIS_LINES, TILE_INDEX, TRAVEL_MASK
+
+EMPTY, BLACK, WHITE = 0, 1, 2
+BLACK_TO_MOVE, WHITE_TO_MOVE = 0, 1
+PLAYER_CODES = {"black": BLACK_TO_MOVE, "white": WHITE_TO_MOVE}
+PIECE_CODES = {"black": BLACK, "white": WHITE}
+
+# Column added after the 25 tiles that is always empty, used to pad paths
+_PAD = 25
+
+
+def _slide_table():
+    """Every straight (source, destination) slide, with the tiles it passes over.
+
+    Returns:
+        tuple: (sources, destinations, paths, travel_ok) where paths is padded
+            with _PAD and travel_ok[p, e] says whether every tile passed over is
+            of the travel color of player p
+    """
+    sources, destinations, paths = [], [], []
+    for tile in BOARD_TILES:
+        for ray in RAYS[tile]:
+            for step, (dest, _) in enumerate(ray):
+                passed = [TILE_INDEX[t] for t, _ in ray[:step]]
+                sources.append(TILE_INDEX[tile])
+                destinations.append(TILE_INDEX[dest])
+                paths.append(passed + [_PAD] * (4 - len(passed)))
+    paths = np.array(paths, dtype=np.intp)
+    travel_ok = np.zeros((2, len(sources)), dtype=bool)
+    for color, player in PLAYER_CODES.items():
+        travel = np.array([bool(TRAVEL_MASK[color] >> i & 1) for i in range(25)] + [True])
+        travel_ok[player] = travel[paths].all(axis=1)
+    return np.array(sources, dtype=np.intp), np.array(destinations, dtype=np.intp), paths, travel_ok
+
+
+SLIDE_SOURCES, SLIDE_DESTINATIONS, SLIDE_PATHS, SLIDE_TRAVEL_OK = _slide_table()
+
+
+def _line_matrix(lines):
+    """(line mask, ends mask) pairs as two (L, 25) 0/1 matrices."""
+    bits = [[mask >> i & 1 for i in range(25)] for mask, _ in lines]
+    ends = [[mask >> i & 1 for i in range(25)] for _, mask in lines]
+    return np.array(bits, dtype=np.int16), np.array(ends, dtype=np.int16)
+
+
+LINES_4_MATRIX, LINES_4_ENDS = _line_matrix(LINES_4)
+LINES_5_MATRIX, _ = _line_matrix(LINES_5)
+
+
+def _run_points(pattern, length):
+    """Alignment points (as in GameState.count_alignment) of each position of a line holding pattern."""
+    points = []
+    for pos in range(length):
+        if not pattern >> pos & 1:
+            points.append(0)
+            continue
+        start = end = pos
+        while start > 0 and pattern >> (start - 1) & 1:
+            start -= 1
+        while end < length - 1 and pattern >> (end + 1) & 1:
+            end += 1
+        points.append({2: 2, 3: 5}.get(end - start + 1, 0))
+    return points + [0] * (5 - length)
+
+
+# AXIS_LINE_TILES[k]: tile indexes of AXIS_LINES[k], padded with _PAD to five
+AXIS_LINE_TILES = np.array([[TILE_INDEX[tile] for tile in line] + [_PAD] * (5 - len(line)) for line in AXIS_LINES],
+                           dtype=np.intp)
+# LINE_RUN_POINTS[k, pattern, pos]: points of position pos of line k for a pattern of pieces on it
+LINE_RUN_POINTS = np.array([[_run_points(pattern, len(line)) for pattern in range(32)] for line in AXIS_LINES],
+                           dtype=np.int32)
+# The (line, position in line) of every tile on its three axis lines
+TILE_LINES = np.array([TILE_AXIS_LINES[tile] for tile in BOARD_TILES], dtype=np.intp)
+TILE_LINE_POSITIONS = np.array([[AXIS_LINES[k].index(tile) for k in TILE_AXIS_LINES[tile]] for tile in BOARD_TILES],
+                               dtype=np.intp)
+
+
+def encode_states(states):
+    """Pack GameState objects into the (boards, reserves, players) batch encoding."""
+    boards = np.zeros((len(states), 25), dtype=np.int8)
+    reserves = np.zeros((len(states), 2), dtype=np.int16)
+    players = np.zeros(len(states), dtype=np.int8)
+    for row, state in enumerate(states):
+        for color, code in PIECE_CODES.items():
+            mask = state.masks[color]
+            for i in range(25):
+                if mask >> i & 1:
+                    boards[row, i] = code
+        reserves[row] = state.reserve["black"], state.reserve["white"]
+        players[row] = PLAYER_CODES[state.current_player]
+    return boards, reserves, players
+
+
+def _legal_slides(boards, players):
+    """(N, slides) mask of the entries of the slide table that are legal for the given players."""
+    empty = np.ones((len(boards), 26), dtype=bool)
+    empty[:, :25] = boards == EMPTY
+    own = boards == (np.asarray(players) + 1)[:, None]  # BLACK / WHITE codes follow the player codes
+    return (own[:, SLIDE_SOURCES]
+            & empty[:, SLIDE_DESTINATIONS]
+            & empty[:, SLIDE_PATHS].all(axis=2)
+            & SLIDE_TRAVEL_OK[players])
+
+
+def movable_masks(boards, players):
+    """Destinations of every piece of the player to move.
+
+    Returns:
+        ndarray: (N, 25, 25) bool, [n, source, destination]
+    """
+    count = len(boards)
+    ok = _legal_slides(boards, players)
+    moves = np.zeros((count, 25, 25), dtype=bool)
+    rows, slides = np.nonzero(ok)
+    moves[rows, SLIDE_SOURCES[slides], SLIDE_DESTINATIONS[slides]] = True
+    return moves
+
+
+def legal_move_masks(boards, reserves, players):
+    """Batched GameState.get_valid_plays.
+
+    Args:
+        boards: (N, 25) board encodings
+        reserves: (N, 2) reserves of black and white
+        players: (N,) player to move
+
+    Returns:
+        tuple: (placements, moves) with placements an (N, 25) bool mask of the
+            tiles the player may place on and moves the (N, 25, 25) mask of movable_masks
+    """
+    boards = np.asarray(boards)
+    players = np.asarray(players, dtype=np.intp)
+    has_reserve = np.asarray(reserves)[np.arange(len(boards)), players] > 0
+    placements = (boards == EMPTY) & has_reserve[:, None]
+    return placements, movable_masks(boards, players)
+
+
+def decode_moves(placements, moves):
+    """Turn one row of legal_move_masks into the move list of get_valid_plays, in the same order."""
+    plays = [("move", BOARD_TILES[source], BOARD_TILES[dest]) for source, dest in zip(*np.nonzero(moves))]
+    plays += [("place", BOARD_TILES[tile]) for tile in np.flatnonzero(placements)]
+    return plays
+
+
+def alignment_points(boards, code):
+    """Batched GameState.count_alignment for every piece of one color.
+
+    Returns:
+        ndarray: (N, 25) points, 0 on tiles without a piece of that color
+    """
+    own = np.zeros((len(boards), 26), dtype=np.intp)
+    own[:, :25] = boards == code
+    # pattern of the pieces on each axis line, then the points of every position from the line table
+    patterns = (own[:, AXIS_LINE_TILES] << np.arange(5)).sum(axis=2)
+    line_points = LINE_RUN_POINTS[np.arange(len(AXIS_LINES)), patterns]
+    return line_points[:, TILE_LINES, TILE_LINE_POSITIONS].sum(axis=2)
+
+
+def evaluate_boards(boards, reserves, destinations, ai_color):
+    """Batched GameState.evaluate_board, with identical scores.
+
+    Args:
+        boards: (N, 25) board encodings
+        reserves: (N, 2) reserves of black and white
+        destinations: (N,) tile index the last play moved a piece to, or -1 if
+            the last play was a placement (or there was none)
+        ai_color: "black" or "white"
+
+    Returns:
+        ndarray: (N,) int scores
+    """
+    boards = np.asarray(boards)
+    reserves = np.asarray(reserves)
+    destinations = np.asarray(destinations, dtype=np.intp)
+    count = len(boards)
+    ai_code = PIECE_CODES[ai_color]
+    opponent_code = WHITE if ai_code == BLACK else BLACK
+    ai = boards == ai_code
+    opponent = boards == opponent_code
+
+    # Immediate loss: a full line of five of either color
+    lost = ((ai.astype(np.int16) @ LINES_5_MATRIX.T == 5).any(axis=1)
+            | (opponent.astype(np.int16) @ LINES_5_MATRIX.T == 5).any(axis=1))
+
+    # Win: a run of exactly four through the destination, for the color of the moved piece
+    moved = destinations >= 0
+    rows = np.arange(count)
+    mover = np.where(moved, boards[rows, np.where(moved, destinations, 0)], EMPTY)
+    mover_pieces = (boards == mover[:, None]).astype(np.int16)
+    fours = (mover_pieces @ LINES_4_MATRIX.T == 4) & (mover_pieces @ LINES_4_ENDS.T == 0)
+    through = LINES_4_MATRIX.T[np.where(moved, destinations, 0)].astype(bool)
+    won = moved & (mover != EMPTY) & (fours & through).any(axis=1)
+
+    ai_points = alignment_points(boards, ai_code)
+    opponent_points = alignment_points(boards, opponent_code)
+    score = -(opponent_points >= 3).sum(axis=1) * 1000
+    score += ai_points.sum(axis=1) * 10
+    score -= opponent_points.sum(axis=1) * 15
+
+    # Mobility: piece moves plus placements for each side, whoever is to move
+    empty_tiles = (boards == EMPTY).sum(axis=1)
+    ai_player = PLAYER_CODES[ai_color]
+    ai_moves = _legal_slides(boards, np.full(count, ai_player)).sum(axis=1)
+    opponent_moves = _legal_slides(boards, np.full(count, 1 - ai_player)).sum(axis=1)
+    ai_moves += np.where(reserves[:, ai_player] > 0, empty_tiles, 0)
+    opponent_moves += np.where(reserves[:, 1 - ai_player] > 0, empty_tiles, 0)
+    score += (ai_moves - opponent_moves) * 5
+
+    score = np.where(won, np.where(mover == ai_code, 9000, -9000), score)
+    return np.where(lost, -10000, score)
+
+
+def encode_plays(plays):
+    """Last plays as the destinations argument of evaluate_boards."""
+    return np.array([TILE_INDEX[play[2]] if play and play[0] == "move" else -1 for play in plays],
+                    dtype=np.intp)
@@ -0,0 +1,178 @@
+"""Static Yonmoque-Hex board geometry, computed once at import time.
+
+Tiles use the same (x, y) coordinates as the GUI, with x and y in 1..5.
+Every table is keyed by tile so the rule functions in GameState only do
+lookups and bit operations instead of rebuilding dicts and walking rays.
+"""
+
+# Bitboard layout: tile (x, y) is stored in bit (x-1)*5 + (y-1)
+BOARD_TILES = [(x, y) for x in range(1, 6) for y in range(1, 6)]
+TILE_INDEX = {tile: i for i, tile in enumerate(BOARD_TILES)}
+TILE_MASK = {tile: 1 << i for i, tile in enumerate(BOARD_TILES)}
+FULL_BOARD = (1 << len(BOARD_TILES)) - 1
+
+# The six hex directions, as pairs of opposite directions per axis
+DIRECTIONS = [
+    (0, 1), (0, -1),  # Vertical
+    (1, 0), (-1, 0),  # Horizontal
+    (1, -1), (-1, 1)  # Diagonal
+]
+AXES = [(0, 1), (1, 0), (1, -1)]
+
+# Color class of every tile
+TILE_COLORS = {
+    (1, 1): "grey", (1, 2): "darkblue", (1, 3): "darkblue", (1, 4): "darkblue", (1, 5): "grey",
+    (2, 1): "darkblue", (2, 2): "white", (2, 3): "white", (2, 4): "white", (2, 5): "darkblue",
+    (3, 1): "darkblue", (3, 2): "white", (3, 3): "grey", (3, 4): "white", (3, 5): "darkblue",
+    (4, 1): "darkblue", (4, 2): "white", (4, 3): "white", (4, 4): "white", (4, 5): "darkblue",
+    (5, 1): "grey", (5, 2): "darkblue", (5, 3): "darkblue", (5, 4): "darkblue", (5, 5): "grey",
+}
+
+# Tiles a piece of each color may keep sliding over (black travels on darkblue)
+TRAVEL_COLOR = {"black": "darkblue", "white": "white"}
+TRAVEL_MASK = {
+    piece_color: sum(TILE_MASK[tile] for tile in BOARD_TILES if TILE_COLORS[tile] == tile_color)
+    for piece_color, tile_color in TRAVEL_COLOR.items()
+}
+
+
+def iter_tiles(mask):
+    """Yield the (x, y) tiles whose bits are set in a board mask."""
+    while mask:
+        low = mask & -mask
+        yield BOARD_TILES[low.bit_length() - 1]
+        mask ^= low
+
+
+def _on_board(x, y):
+    return 1 <= x <= 5 and 1 <= y <= 5
+
+
+def _ray(tile, direction):
+    """Tiles met when walking from tile (exclusive) in one direction."""
+    x, y = tile
+    dx, dy = direction
+    tiles = []
+    while _on_board(x + dx, y + dy):
+        x += dx
+        y += dy
+        tiles.append((x, y))
+    return tiles
+
+
+def _mask_of(tiles):
+    mask = 0
+    for tile in tiles:
+        mask |= TILE_MASK[tile]
+    return mask
+
+
+def _reach_table(ray, piece_color):
+    """Map every occupancy pattern of a ray to the destinations it leaves open.
+
+    A piece stops before the first occupied tile and may only continue past
+    tiles of its travel color.
+    """
+    ray_mask = _mask_of(ray)
+    table = {}
+    pattern = ray_mask
+    while True:  # enumerate every sub-mask of ray_mask
+        reach = 0
+        for tile in ray:
+            tile_mask = TILE_MASK[tile]
+            if pattern & tile_mask:
+                break
+            reach |= tile_mask
+            if not TRAVEL_MASK[piece_color] & tile_mask:
+                break
+        table[pattern] = reach
+        if pattern == 0:
+            break
+        pattern = (pattern - 1) & ray_mask
+    return ray_mask, table
+
+
+def _run_table(tile, axis):
+    """Map the pieces on a tile's axis line to the length of the run through it.
+
+    The tile itself always counts as one, as in GameState.count_alignment.
+    """
+    forward = _ray(tile, axis)
+    backward = _ray(tile, (-axis[0], -axis[1]))
+    line_mask = _mask_of(forward + backward)
+    table = {}
+    pattern = line_mask
+    while True:
+        count = 1
+        for side in (forward, backward):
+            for other in side:
+                if not pattern & TILE_MASK[other]:
+                    break
+                count += 1
+        table[pattern] = count
+        if pattern == 0:
+            break
+        pattern = (pattern - 1) & line_mask
+    return line_mask, table
+
+
+def _windows(length):
+    """Every run of `length` consecutive tiles along an axis, with the tiles just past its ends."""
+    windows = []
+    for tile in BOARD_TILES:
+        for dx, dy in AXES:
+            # each window is generated once, from its first tile along the axis
+            run = [tile] + _ray(tile, (dx, dy))[:length - 1]
+            if len(run) < length:
+                continue
+            ends = [(tile[0] - dx, tile[1] - dy), (run[-1][0] + dx, run[-1][1] + dy)]
+            windows.append((_mask_of(run), _mask_of(t for t in ends if _on_board(*t))))
+    return windows
+
+
+# RAYS[tile][d]: tiles (with their masks) walked from tile in DIRECTIONS[d]
+RAYS = {
+    tile: [[(t, TILE_MASK[t]) for t in _ray(tile, d)] for d in DIRECTIONS]
+    for tile in BOARD_TILES
+}
+
+# REACH[color][tile]: per direction, (ray mask, {blocking pattern: destination mask})
+REACH = {
+    color: {tile: [_reach_table(_ray(tile, d), color) for d in DIRECTIONS] for tile in BOARD_TILES}
+    for color in TRAVEL_COLOR
+}
+
+# REACH_COUNTS[color][tile]: like REACH, with the number of destinations instead of their mask
+REACH_COUNTS = {
+    color: {
+        tile: [(ray_mask, {pattern: bin(reach).count("1") for pattern, reach in table.items()})
+               for ray_mask, table in rays]
+        for tile, rays in tiles.items()
+    }
+    for color, tiles in REACH.items()
+}
+
+# RUNS[tile]: per axis, (line mask, {pieces on the line: run length through tile})
+RUNS = {tile: [_run_table(tile, axis) for axis in AXES] for tile in BOARD_TILES}
+
+# Lines of 4 and 5 as (line mask, mask of the on-board tiles just past both ends)
+LINES_4 = _windows(4)
+LINES_5 = _windows(5)
+LINES_4_THROUGH = {
+    tile: [line for line in LINES_4 if line[0] & TILE_MASK[tile]] for tile in BOARD_TILES
+}
+LINES_5_THROUGH = {
+    tile: [line for line in LINES_5 if line[0] & TILE_MASK[tile]] for tile in BOARD_TILES
+}
+
+# AXIS_LINES[k]: the tiles of the k-th full board line along an axis, in order
+AXIS_LINES = [
+    [tile] + _ray(tile, axis)
+    for axis in AXES for tile in BOARD_TILES
+    if not _on_board(tile[0] - axis[0], tile[1] - axis[1])
+]
+AXIS_LINE_MASKS = [_mask_of(line) for line in AXIS_LINES]
+# TILE_AXIS_LINES[tile]: indexes into AXIS_LINES of the three lines through tile
+TILE_AXIS_LINES = {
+    tile: [k for k, line in enumerate(AXIS_LINES) if tile in line] for tile in BOARD_TILES
+}
@@ -0,0 +1,18 @@
+"""Difficulty levels shared by the GUI and the headless tools (benchmark.py)."""
+import os
+
+# Minimax difficulty levels: (maximum depth, time budget per move in ms, worker processes)
+MINIMAX_DIFFICULTY = {
+    "easy": (2, 1000, 1),
+    "intermediate": (3, 2000, 1),
+    "hard": (5, 5000, os.cpu_count() or 1),
+}
+
+# MCTS difficulty levels: (rollout depth, simulations per move)
+# Every level searches one tree, which MCTSEngine keeps from one move to the next;
+# root parallelization (montecarlo(parallel="root")) is left to callers that ask for it
+MONTECARLO_DIFFICULTY = {
+    "easy": (3, 50),
+    "intermediate": (5, 50),
+    "hard": (8, 250),
+}
@@ -0,0 +1,149 @@
+"""Compact game records: one byte per move in an append-only, framed file.
+
+A move byte is an index into the move table of the color that played it:
+the 25 placements come first, then every (from, to) slide that a piece of
+that color can ever make. A single table would need 261 entries (25
+placements plus 236 slides over both colors), one more byte's worth than
+fits. Per color it is 185 for black and 213 for white. Games start from the
+empty board with black to move, so the color of every move follows from its
+position in the game.
+
+File layout:
+    header: b"YMGR" + version byte
+    frames: move count (uint16, little endian), result byte, then one byte per move
+The result byte is 0 for a draw or unfinished game, 1 when black won and 2
+when white won. A frame cut short by an interrupted append is ignored by the
+reader and cut off by the next write_games before it appends, so files can be
+appended to safely from long-running jobs.
+"""
+import os
+import struct
+from .BoardGeometry import BOARD_TILES, REACH, iter_tiles
+
+FILE_MAGIC = b"YMGR"
+FILE_VERSION = 1
+FRAME_HEADER = struct.Struct("<HB")  # move count, result
+RESULTS = (None, "black", "white")
+
+
+def _move_table(color):
+    """Every move a piece of color can ever play, in a fixed order: placements, then slides."""
+    moves = [("place", tile) for tile in BOARD_TILES]
+    for tile in BOARD_TILES:
+        reach = 0
+        for _, destinations in REACH[color][tile]:
+            for destination_mask in destinations.values():
+                reach |= destination_mask
+        moves.extend(("move", tile, destination) for destination in iter_tiles(reach))
+    return moves
+
+
+# MOVE_TABLES[color][code]: move for a byte; MOVE_CODES[color][move]: byte for a move
+MOVE_TABLES = {color: _move_table(color) for color in REACH}
+MOVE_CODES = {color: {move: code for code, move in enumerate(table)} for color, table in MOVE_TABLES.items()}
+
+
+def move_to_byte(move, color):
+    """One-byte code of a move played by color.
+
+    Raises:
+        ValueError: If no piece of color can ever play the move
+    """
+    try:
+        return MOVE_CODES[color][move]
+    except KeyError:
+        raise ValueError(f"Not a {color} move: {move}") from None
+
+
+def byte_to_move(code, color):
+    """Inverse of move_to_byte."""
+    return MOVE_TABLES[color][code]
+
+
+def encode_game(moves):
+    """Move bytes of a game played from the start (black moves first)."""
+    return bytes(move_to_byte(move, "white" if ply % 2 else "black") for ply, move in enumerate(moves))
+
+
+def decode_game(data):
+    """Inverse of encode_game."""
+    return [byte_to_move(code, "white" if ply % 2 else "black") for ply, code in enumerate(data)]
+
+
+def _complete_length(record_file, path):
+    """Length of the header and the complete frames of an open record file (frames are skipped, not decoded).
+
+    Raises:
+        ValueError: If the file does not start with a game record header
+    """
+    size = record_file.seek(0, 2)
+    record_file.seek(0)
+    header = record_file.read(len(FILE_MAGIC) + 1)
+    if len(header) < len(FILE_MAGIC) + 1 and FILE_MAGIC.startswith(header[:len(FILE_MAGIC)]):
+        return 0  # the header itself was cut short: start the file over
+    if header != FILE_MAGIC + bytes([FILE_VERSION]):
+        raise ValueError(f"Not a game record file: {path}")
+    end = len(header)
+    while end + FRAME_HEADER.size <= size:
+        length, _ = FRAME_HEADER.unpack(record_file.read(FRAME_HEADER.size))
+        if end + FRAME_HEADER.size + length > size:
+            break
+        end += FRAME_HEADER.size + length
+        record_file.seek(end)
+    return end
+
+
+def write_games(path, games):
+    """Append games to a record file, creating it if needed.
+
+    A frame left incomplete by an interrupted earlier append is cut off first,
+    which takes one pass over the frame headers of the file. The games are then
+    encoded and written one by one, so any iterable (e.g. a generator over a
+    self-play run) can be streamed to disk.
+
+    Args:
+        path: Record file
+        games: Iterable of (moves, winner) with winner "black", "white" or None
+
+    Returns:
+        int: Number of games written
+
+    Raises:
+        ValueError: If path exists and is not a game record file
+    """
+    count = 0
+    with open(path, "r+b" if os.path.exists(path) else "w+b") as record_file:
+        end = _complete_length(record_file, path)
+        record_file.truncate(end)
+        record_file.seek(end)
+        if end == 0:
+            record_file.write(FILE_MAGIC + bytes([FILE_VERSION]))
+        for moves, winner in games:
+            data = encode_game(moves)
+            record_file.write(FRAME_HEADER.pack(len(data), RESULTS.index(winner)) + data)
+            count += 1
+    return count
+
+
+def read_games(path):
+    """Stream the games of a record file, one at a time.
+
+    Yields:
+        tuple: (moves, winner) as written by write_games
+
+    Raises:
+        ValueError: If the file is not a game record
+    """
+    with open(path, "rb") as record_file:
+        header = record_file.read(len(FILE_MAGIC) + 1)
+        if header[:len(FILE_MAGIC)] != FILE_MAGIC or header[len(FILE_MAGIC):] != bytes([FILE_VERSION]):
+            raise ValueError(f"Not a game record file: {path}")
+        while True:
+            frame = record_file.read(FRAME_HEADER.size)
+            if len(frame) < FRAME_HEADER.size:
+                return  # end of file, or a frame header cut short
+            length, result = FRAME_HEADER.unpack(frame)
+            data = record_file.read(length)
+            if len(data) < length:
+                return  # the last append was interrupted
+            yield decode_game(data), RESULTS[result]
@@ -0,0 +1,577 @@
+import copy
+import random
+from .BoardGeometry import (AXIS_LINE_MASKS, AXIS_LINES, BOARD_TILES, FULL_BOARD, LINES_4_THROUGH,
+                           LINES_5, RAYS, REACH, REACH_COUNTS, RUNS, TILE_AXIS_LINES, TILE_INDEX,
+                           TILE_MASK, iter_tiles)
+
+
+# 64-bit Zobrist keys. The fixed seed keeps hashes identical between runs and
+# processes, so they can be stored on disk or compared across workers.
+_zobrist_rng = random.Random(0x59304E4D)
+ZOBRIST_PIECE = {
+    color: {tile: _zobrist_rng.getrandbits(64) for tile in BOARD_TILES} for color in ("black", "white")
+}
+ZOBRIST_FLIP = {tile: ZOBRIST_PIECE["black"][tile] ^ ZOBRIST_PIECE["white"][tile] for tile in BOARD_TILES}
+ZOBRIST_RESERVE = {color: [_zobrist_rng.getrandbits(64) for _ in range(7)] for color in ("black", "white")}
+ZOBRIST_TURN = {"black": 0, "white": _zobrist_rng.getrandbits(64)}
+
+
+def _alignment_points(run_length):
+    """Points count_alignment gives a piece for its run along one axis."""
+    if run_length == 3:
+        return 5
+    if run_length == 2:
+        return 2
+    return 0
+
+
+def _line_points(line):
+    """Map every pattern of pieces on a line to the alignment points of each position."""
+    line_mask = AXIS_LINE_MASKS[AXIS_LINES.index(line)]
+    table = {}
+    pattern = line_mask
+    while True:  # enumerate every sub-mask of line_mask
+        occupied = [bool(pattern & TILE_MASK[tile]) for tile in line]
+        points = []
+        for pos in range(len(line)):
+            if not occupied[pos]:
+                points.append(0)
+                continue
+            start = end = pos
+            while start > 0 and occupied[start - 1]:
+                start -= 1
+            while end < len(line) - 1 and occupied[end + 1]:
+                end += 1
+            points.append(_alignment_points(end - start + 1))
+        table[pattern] = tuple(points)
+        if pattern == 0:
+            break
+        pattern = (pattern - 1) & line_mask
+    return table
+
+
+# Evaluation terms are kept per line so a changed tile only touches its three lines
+LINE_POINTS = [_line_points(line) for line in AXIS_LINES]
+LINE_INDEXES = [[TILE_INDEX[tile] for tile in line] for line in AXIS_LINES]
+NO_MOBILITY = [0] * 6
+
+class GameState:
+    """Maintains the game state incuding piece positions, valid moves and game rules"""
+    def __init__(self):
+        """Initialize a new game state with default values"""
+        self.reset()
+
+    #Function to reset the board state (no pieces)
+    def reset(self):
+        """Reset the game:
+            - Empty board
+            - Full Reserves
+            - Black player starts"""
+        self.masks = {"black": 0, "white": 0}  # one bitboard per color
+        self.occupied_mask = 0
+        self.reserve = {"black": 6, "white": 6}
+        self._current_player = "black"
+        self.hash = self.compute_hash()
+
+        # Incrementally maintained evaluation terms (see evaluate_board)
+        self.align_points = {"black": [0] * 25, "white": [0] * 25}  # count_alignment per tile
+        self.align_total = {"black": 0, "white": 0}
+        self.strong_pieces = {"black": 0, "white": 0}  # pieces with count_alignment >= 3
+        self.ray_mobility = [0] * (25 * 6)  # destinations per tile and direction
+        self.mobility = {"black": 0, "white": 0}  # 'move' plays available per color
+
+    @property
+    def current_player(self):
+        """Color to move"""
+        return self._current_player
+
+    @current_player.setter
+    def current_player(self, player):
+        # Callers switch turns by assignment, so keep the hash in sync here
+        self.hash ^= ZOBRIST_TURN[self._current_player] ^ ZOBRIST_TURN[player]
+        self._current_player = player
+
+    def compute_hash(self):
+        """Compute the Zobrist hash from scratch (self.hash is kept up to date incrementally).
+                Covers piece placement per color, reserve counts and side to move.
+                Returns:
+                    int: 64-bit position hash
+                """
+        position_hash = ZOBRIST_TURN[self._current_player]
+        for color in ("black", "white"):
+            position_hash ^= ZOBRIST_RESERVE[color][self.reserve[color]]
+            for tile in iter_tiles(self.masks[color]):
+                position_hash ^= ZOBRIST_PIECE[color][tile]
+        return position_hash
+
+    @property
+    def pieces(self):
+        """List view of the board as (tile, color) tuples, built from the bitboards"""
+        return ([(tile, "black") for tile in iter_tiles(self.masks["black"])] +
+                [(tile, "white") for tile in iter_tiles(self.masks["white"])])
+
+    @property
+    def occupied(self):
+        """Set view of the occupied tiles"""
+        return set(iter_tiles(self.occupied_mask))
+
+    def copy_state(self):
+        """Create a lightweight copy of the game state"""
+        new_state = GameState.__new__(GameState)  # create instance without calling __init__
+        new_state.masks = self.masks.copy()
+        new_state.occupied_mask = self.occupied_mask
+        new_state.reserve = self.reserve.copy()
+        new_state._current_player = self._current_player
+        new_state.hash = self.hash
+        new_state.align_points = {"black": self.align_points["black"][:], "white": self.align_points["white"][:]}
+        new_state.align_total = self.align_total.copy()
+        new_state.strong_pieces = self.strong_pieces.copy()
+        new_state.ray_mobility = self.ray_mobility[:]
+        new_state.mobility = self.mobility.copy()
+        return new_state
+
+    def to_dict(self):
+        """Describe the position with plain lists and dicts (e.g. for JSON).
+                Returns:
+                    dict: {"black": [[x, y], ...], "white": [...], "reserve": {...}, "to_move": color}
+                """
+        return {
+            "black": [list(tile) for tile in iter_tiles(self.masks["black"])],
+            "white": [list(tile) for tile in iter_tiles(self.masks["white"])],
+            "reserve": dict(self.reserve),
+            "to_move": self._current_player,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a position described by to_dict.
+                Missing keys keep their start-of-game values.
+                Raises:
+                    ValueError: If a tile, color or reserve count is invalid
+                """
+        state = cls()
+        for color in ("black", "white"):
+            for tile in data.get(color, []):
+                tile = tuple(tile)
+                if tile not in TILE_MASK or state.occupied_mask & TILE_MASK[tile]:
+                    raise ValueError(f"Invalid or repeated tile for {color}: {tile}")
+                state._put(tile, color)
+        for color, count in data.get("reserve", {}).items():
+            if color not in state.reserve or not 0 <= count <= 6:
+                raise ValueError(f"Invalid reserve: {color}={count}")
+            state.reserve[color] = count
+        to_move = data.get("to_move", "black")
+        if to_move not in ("black", "white"):
+            raise ValueError(f"Invalid player to move: {to_move}")
+        state._current_player = to_move
+        state.hash = state.compute_hash()
+        return state
+
+    # Board mutations. Every change goes through these three so the masks, the
+    # hash and the evaluation terms stay in sync.
+    def _put(self, tile, color):
+        """Add a piece of color on an empty tile."""
+        tile_mask = TILE_MASK[tile]
+        self.masks[color] |= tile_mask
+        self.occupied_mask |= tile_mask
+        self.hash ^= ZOBRIST_PIECE[color][tile]
+        self._update_alignment(tile, color)
+        self._fill_mobility(tile, color)
+        self._refresh_neighbour_mobility(tile)
+
+    def _lift(self, tile, color):
+        """Remove the piece of color from a tile."""
+        tile_mask = TILE_MASK[tile]
+        self.masks[color] ^= tile_mask
+        self.occupied_mask ^= tile_mask
+        self.hash ^= ZOBRIST_PIECE[color][tile]
+        self._update_alignment(tile, color)
+        self._clear_mobility(tile, color)
+        self._refresh_neighbour_mobility(tile)
+
+    def _recolor(self, tile, color):
+        """Flip the piece on a tile to color (occupancy, and so other pieces' mobility, is unchanged)."""
+        other = "white" if color == "black" else "black"
+        tile_mask = TILE_MASK[tile]
+        self.masks[other] ^= tile_mask
+        self.masks[color] |= tile_mask
+        self.hash ^= ZOBRIST_FLIP[tile]
+        self._update_alignment(tile, other)
+        self._update_alignment(tile, color)
+        self._clear_mobility(tile, other)
+        self._fill_mobility(tile, color)
+
+    def _update_alignment(self, tile, color):
+        """Refresh color's alignment points on the three lines through a tile that just changed."""
+        color_mask = self.masks[color]
+        tile_mask = TILE_MASK[tile]
+        points = self.align_points[color]
+        total = self.align_total[color]
+        strong = self.strong_pieces[color]
+        for k in TILE_AXIS_LINES[tile]:
+            pattern = color_mask & AXIS_LINE_MASKS[k]
+            line_points = LINE_POINTS[k]
+            for index, old, new in zip(LINE_INDEXES[k], line_points[pattern ^ tile_mask], line_points[pattern]):
+                if old != new:
+                    before = points[index]
+                    after = before + new - old
+                    points[index] = after
+                    total += new - old
+                    if before >= 3 > after:
+                        strong -= 1
+                    elif after >= 3 > before:
+                        strong += 1
+        self.align_total[color] = total
+        self.strong_pieces[color] = strong
+
+    def _fill_mobility(self, tile, color):
+        """Count the destinations of the piece of color on a tile."""
+        occupied = self.occupied_mask
+        counts = [table[occupied & ray_mask] for ray_mask, table in REACH_COUNTS[color][tile]]
+        base = TILE_INDEX[tile] * 6
+        self.ray_mobility[base:base + 6] = counts
+        self.mobility[color] += sum(counts)
+
+    def _clear_mobility(self, tile, color):
+        """Drop the destinations counted for the piece of color that left a tile."""
+        base = TILE_INDEX[tile] * 6
+        self.mobility[color] -= sum(self.ray_mobility[base:base + 6])
+        self.ray_mobility[base:base + 6] = NO_MOBILITY
+
+    def _refresh_neighbour_mobility(self, tile):
+        """Recount the ray pointing at a tile for the nearest piece in each direction.
+
+        Pieces further away are blocked by that nearest piece, so only its
+        count can change when the tile's occupancy does.
+        """
+        occupied = self.occupied_mask
+        black_mask = self.masks["black"]
+        ray_mobility = self.ray_mobility
+        for direction, ray in enumerate(RAYS[tile]):
+            for other, other_mask in ray:
+                if occupied & other_mask:
+                    color = "black" if black_mask & other_mask else "white"
+                    back = direction ^ 1  # DIRECTIONS lists opposite directions in pairs
+                    ray_mask, table = REACH_COUNTS[color][other][back]
+                    index = TILE_INDEX[other] * 6 + back
+                    count = table[occupied & ray_mask]
+                    self.mobility[color] += count - ray_mobility[index]
+                    ray_mobility[index] = count
+                    break
+
+    def place_piece(self, tile, color):
+        """Place a new piece from reserves onto the board.
+                Args:
+                    tile: (x,y) position to place
+                    color: Player color making placement
+                Returns:
+                    GameState: New state with updated piece positions
+                """
+        # Create a deep copy of the current game state
+        #new_state = copy.deepcopy(self)
+
+        tile_mask = TILE_MASK[tile]
+        if self.occupied_mask & tile_mask:
+            print("Tile already occupied")
+            return self  # Return the unchanged state
+
+        if self.reserve[color] <= 0:
+            print(f"No {color} pieces left to place")
+            return self  # Return the unchanged state
+
+        # Apply the placement in the new state
+        new_state = self.copy_state()
+        new_state._put(tile, color)
+        new_state.reserve[color] -= 1
+        new_state.hash ^= ZOBRIST_RESERVE[color][self.reserve[color]] ^ ZOBRIST_RESERVE[color][new_state.reserve[color]]
+
+        return new_state  # Return the updated game state
+
+    def make_move(self, move):
+        """Move an existing piece to a new position and handle piece flipping.
+                Args:
+                    move: Tuple containing move type and positions
+                Returns:
+                    GameState: New state with updated piece positions
+                """
+        new_state = self.copy_state()
+
+        if type(move[0]) == str:
+            _, piece_pos, new_tile = move  # piece_pos is (x, y) instead of an index
+        else:
+            piece_pos, new_tile = move
+
+        # Find the piece that is currently at piece_pos
+        piece = self.get_piece_at(piece_pos)
+        if piece is None:
+            print(f"Error: Piece at position {piece_pos} not found!")
+            return self  # Return the unchanged state if there's an error
+
+        # Move the piece
+        piece_color = piece[1]
+        new_state._lift(piece_pos, piece_color)
+        new_state._put(new_tile, piece_color)
+
+        # Flip pieces if necessary
+        new_state.flip_pieces(new_tile)
+        return new_state
+
+    def apply(self, move):
+        """Apply a legal move in place for the current player and pass the turn.
+                Unlike place_piece/make_move no copy is made, so searches can walk
+                the tree on a single state and restore it with undo().
+                Args:
+                    move: ('place', tile) or ('move', from_pos, to_pos)
+                Returns:
+                    tuple: Undo token to hand back to undo()
+                """
+        player = self._current_player
+        opponent = "white" if player == "black" else "black"
+        if move[0] == "place":
+            reserve_keys = ZOBRIST_RESERVE[player]
+            self._put(move[1], player)
+            self.hash ^= reserve_keys[self.reserve[player]] ^ reserve_keys[self.reserve[player] - 1]
+            self.reserve[player] -= 1
+            flipped = 0
+        else:
+            _, piece_pos, new_tile = move
+            self._lift(piece_pos, player)
+            self._put(new_tile, player)
+            flipped = self.flip_pieces(new_tile)
+
+        self._current_player = opponent
+        self.hash ^= ZOBRIST_TURN[player] ^ ZOBRIST_TURN[opponent]
+        return move, player, flipped
+
+    def undo(self, undo_token):
+        """Revert a move made with apply(), restoring the exact previous state.
+                Args:
+                    undo_token: Value returned by the matching apply() call
+                """
+        move, player, flipped = undo_token
+        opponent = "white" if player == "black" else "black"
+        self._current_player = player
+        self.hash ^= ZOBRIST_TURN[player] ^ ZOBRIST_TURN[opponent]
+
+        for tile in iter_tiles(flipped):
+            self._recolor(tile, opponent)
+
+        if move[0] == "place":
+            reserve_keys = ZOBRIST_RESERVE[player]
+            self._lift(move[1], player)
+            self.hash ^= reserve_keys[self.reserve[player]] ^ reserve_keys[self.reserve[player] + 1]
+            self.reserve[player] += 1
+        else:
+            _, piece_pos, new_tile = move
+            self._lift(new_tile, player)
+            self._put(piece_pos, player)
+
+    def is_game_over(self, play=None):
+        """Check terminal game conditions.
+                Args:
+                    play: Last move made (for win condition check)
+                Returns:
+                    bool: True if game should end
+                """
+        # Always check loss condition (5-in-a-row)
+        if self.check_lose() is not None:
+            return True
+
+        # Only check win condition for moves
+        if play and play[0] == "move":
+            return self.check_win(play) is not None
+
+        return False
+
+    def get_valid_plays(self):
+        """Generate all legal moves for current player.
+                Returns:
+                    list: Valid moves in format [('move', from_pos, to_pos), ...]
+                          or [('place', (x,y)), ...]
+                """
+        valid_moves = []
+
+        for piece_pos in iter_tiles(self.masks[self.current_player]):
+            for dest in iter_tiles(self.movable_mask(piece_pos, self.current_player)):
+                valid_moves.append(("move", piece_pos, dest))
+
+        if self.reserve[self.current_player] > 0:
+            for tile in iter_tiles(FULL_BOARD & ~self.occupied_mask):
+                valid_moves.append(("place", tile))
+
+        return valid_moves
+
+    # BOOLEAN: Check if a tile is occupied
+    def is_tile_occupied(self, tile):
+        return self.occupied_mask & TILE_MASK.get(tile, 0) != 0
+
+
+    # returns a set of the movable places for a piece
+    def movable_places(self, piece_pos, piece_color):
+        """Calculate all valid destinations for a piece.
+                Args:
+                    piece_pos: Current (x,y) position
+                    piece_color: Color of the piece
+                Returns:
+                    set: Valid destination coordinates
+                """
+        return set(iter_tiles(self.movable_mask(piece_pos, piece_color)))
+
+    def movable_mask(self, piece_pos, piece_color):
+        """Bitboard version of movable_places.
+                A piece slides along tiles of its travel color and may take a single
+                step onto any other free tile; the per-ray answers are precomputed.
+                Returns:
+                    int: Mask of the valid destination tiles
+                """
+        occupied = self.occupied_mask
+        reach = 0
+        for ray_mask, destinations in REACH[piece_color][piece_pos]:
+            reach |= destinations[occupied & ray_mask]
+        return reach
+
+
+    def is_valid_move(self, original_position, expected_position):
+        for move in self.movable_places(original_position, self.get_piece_at(original_position)[1]):
+            if move == expected_position:
+                return True
+        return False
+
+
+    def flip_pieces(self, moved_to):
+        """Flip opponent pieces between moved piece and allies.
+                Args:
+                    moved_to: Destination position of moved piece
+                Returns:
+                    int: Mask of the tiles that were flipped
+                """
+        opponent = "white" if self.current_player=="black" else "black"
+        own_mask = self.masks[self.current_player]
+        opponent_mask = self.masks[opponent]
+        flipped = 0
+
+        for ray in RAYS[moved_to]:
+            to_flip = 0
+            for _, tile_mask in ray:
+                if opponent_mask & tile_mask:
+                    to_flip |= tile_mask
+                elif own_mask & tile_mask:
+                    # Flip all opponent pieces in between
+                    flipped |= to_flip
+                    break
+                else:
+                    break
+
+        for tile in iter_tiles(flipped):
+            self._recolor(tile, self.current_player)
+        return flipped
+
+
+    def get_piece_at(self, tile):
+        tile_mask = TILE_MASK.get(tile, 0)
+        if not self.occupied_mask & tile_mask:
+            return None
+        return (tile, "black" if self.masks["black"] & tile_mask else "white")
+
+
+    # Check lose function
+    def check_lose(self):
+        """Check for 5-in-a-row loss condition.
+                Returns:
+                    str/None: Losing color if found, else None
+                """
+        for color in ("black", "white"):
+            color_mask = self.masks[color]
+            for line_mask, _ in LINES_5:
+                if color_mask & line_mask == line_mask:
+                    return color
+        return None
+
+    # Check win does not check if the play was a movement, yet to implement
+    def check_win(self, play=None):
+        """Check if last move created a 4-in-a-row win.
+        Args:
+            play: Move action to check
+        Returns:
+            str/None: Winning color if found, else None
+        """
+        if not play or play[0] != "move":
+            return None  # Only check moves, not placements
+
+        # Get moved piece's final position and color
+        _, initial_pos, dest_pos = play
+        color = self.get_piece_at(dest_pos)[1]
+        color_mask = self.masks[color]
+
+        # A win is a run of exactly four through the destination
+        for line_mask, ends_mask in LINES_4_THROUGH[dest_pos]:
+            if color_mask & line_mask == line_mask and not color_mask & ends_mask:
+                return color
+        return None
+
+
+    def evaluate_board(self, play, ai_color):
+        """Heuristic evaluation function for AI decision-making.
+                Scoring considers:
+                - Immediate win/loss conditions
+                - Threat detection (opponent alignment)
+                - Current piece alignment strength
+                - Mobility advantage
+                """
+        ai_opponent = "black" if ai_color == "white" else "white"
+
+        # Immediate loss/win conditions
+        lose_result = self.check_lose()
+        #if lose_result == ai_color:
+        #    return -10000
+        #elif lose_result == ai_opponent:
+        #    return 10000
+        if lose_result is not None:
+            return -10000
+
+        # Check for win conditions (only after a movement)
+        if play and play[0] == "move":
+            win_result = self.check_win(play)
+            if win_result == ai_color:
+                return 9000
+            elif win_result == ai_opponent:
+                return -9000
+
+        # The terms below are maintained incrementally by every board change
+        score = 0
+
+        # Threat detection: opponent's 3+ alignment
+        score -= self.strong_pieces[ai_opponent] * 1000
+
+        # Alignment scoring
+        score += self.align_total[ai_color] * 10
+        score -= self.align_total[ai_opponent] * 15
+
+        # Mobility: compare AI's and opponent's valid moves (piece moves plus placements)
+        empty_tiles = 25 - bin(self.occupied_mask).count("1")
+        ai_moves = self.mobility[ai_color] + (empty_tiles if self.reserve[ai_color] > 0 else 0)
+        opponent_moves = self.mobility[ai_opponent] + (empty_tiles if self.reserve[ai_opponent] > 0 else 0)
+
+        score += (ai_moves - opponent_moves) * 5
+
+        return score
+
+
+    def count_alignment(self, position, player):
+        """Calculate alignment strength for scoring.
+                Args:
+                    pos: Starting position (x,y)
+                    player: Color to evaluate
+                Returns:
+                    int: Alignment score for this position
+                """
+        player_mask = self.masks[player]
+        total = 0
+        for line_mask, run_lengths in RUNS[position]:
+            count = run_lengths[player_mask & line_mask]
+            if count == 3:
+                total += 5
+            elif count == 2:
+                total += 2
+        return total
+
@@ -0,0 +1,728 @@
+import math
+import os
+import random
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from .GameState import GameState
+from .BoardGeometry import BOARD_TILES, TILE_INDEX, TILE_MASK
+from .MoveOrdering import is_winning_move, threat_mask
+from .SearchStats import SearchStats
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional: ArrayTree then selects children with a plain loop
+    np = None
+
+# Largest seed handed to worker processes and per-rollout generators
+SEED_RANGE = 2 ** 32
+
+# Share of random moves in the epsilon-greedy rollout policy
+EPSILON = 0.2
+# Evaluations kept by the epsilon-greedy policy before its cache is emptied
+EVAL_CACHE_SIZE = 200000
+
+# UCT lookup tables, indexed by visit count: sqrt(log n) for parents and 1 / sqrt(n) for children
+UCT_TABLE_SIZE = 1 << 16
+SQRT_LOG_TABLE = array('d', [0.0] + [math.sqrt(math.log(n)) for n in range(1, UCT_TABLE_SIZE)])
+INV_SQRT_TABLE = array('d', [0.0] + [1 / math.sqrt(n) for n in range(1, UCT_TABLE_SIZE)])
+# Fewest visited children for which the NumPy selection beats the plain loop: the loop
+# grows by about 0.2 us per child and NumPy costs a flat 5 us, so they tie near 24 children
+# and NumPy is ahead from 32 (a full placement ply has 25 to 56 children)
+VECTOR_MIN_CHILDREN = 32
+
+class MCTSNode:
+    """Represents a node in the MCTS (Monte Carlo Tree Search)"""
+    def __init__(self, state, move=None, parent=None, last_move=None):
+        """Initialize MCTS node with game state and metadata
+
+        Args:
+            state: Current game state
+            move: Move that led to this state
+            parent: Parent node in MCTS tree
+            last_move: Last move that led to this state
+        """
+        self.state = state                # The game state at this node.
+        self.move = move                  # The move that led to this state.
+        self.parent = parent              # Parent node.
+        self.last_move = last_move        # Last move applied to reach this state.
+        self.children = []
+        self.visits = 0
+        self.total_reward = 0.0
+        self.untried_moves = state.get_valid_plays()  # All valid moves from this state.
+
+    def is_fully_expanded(self):
+        """Check if all possible moves have been explored from this node."""
+        return len(self.untried_moves) == 0
+
+    def best_child(self, c_param=math.sqrt(2)):
+        """Select child node using Upper Confidence Bound for Trees (UCT) formula.
+
+                Balances exploitation (high reward) vs exploration (under-visited nodes)
+                """
+        log_visits = math.log(self.visits)
+        choices_weights = [
+            (child.total_reward / child.visits) + c_param * math.sqrt(log_visits / child.visits)
+            for child in self.children
+        ]
+        return self.children[choices_weights.index(max(choices_weights))]
+
+    def expand(self, rng=random):
+        """Create new child node by trying an unexplored move.
+
+        Args:
+            rng: Random generator used to pick the move
+        """
+        #select random untried move
+        move = self.untried_moves.pop(rng.randrange(len(self.untried_moves)))
+        new_state = self.state.copy_state()
+
+        # Apply the move (this also switches the player).
+        new_state.apply(move)
+
+        # Create a new node with the move stored as the last move.
+        child_node = MCTSNode(new_state, move=move, parent=self, last_move=move)
+        self.children.append(child_node)
+        return child_node
+
+    def update(self, reward):
+        """Update node statistics after simulation."""
+        self.visits += 1
+        self.total_reward += reward
+
+def choose_move(state, ai_color, rng=random):
+    """Select move using heuristic strategy combining immediate win checks and evaluation.
+
+    Strategy:
+    1. Check for immediate winning/blocking moves when board has >=4 pieces
+    2. Fallback to evaluation function for other cases:
+       - Maximizes score for AI player
+       - Minimizes score for opponent
+    """
+    valid_moves = state.get_valid_plays()
+    if not valid_moves:
+        return None
+
+    # Immediate win/block check
+    if len(state.pieces) >= 4:
+        for move in valid_moves:
+            undo_token = state.apply(move)
+            # If the move ends the game immediately...
+            if state.is_game_over(move):
+                winner = state.check_win(move)
+                state.undo(undo_token)
+                # If it wins for the AI, take it.
+                if winner == ai_color:
+                    return move
+                # Or, if the move prevents an immediate opponent win, choose it.
+                elif winner is not None:
+                    return move
+            else:
+                state.undo(undo_token)
+
+    #Heuristic evaluation fallback
+    if state.current_player == ai_color:
+        best_move = None
+        best_score = -float('inf')
+        for move in valid_moves:
+            undo_token = state.apply(move)
+            score = state.evaluate_board(move, ai_color)
+            state.undo(undo_token)
+            if score > best_score:
+                best_score = score
+                best_move = move
+    else:
+        best_move = None
+        best_score = float('inf')
+        for move in valid_moves:
+            undo_token = state.apply(move)
+            score = state.evaluate_board(move, ai_color)
+            state.undo(undo_token)
+            if score < best_score:
+                best_score = score
+                best_move = move
+
+    return best_move if best_move is not None else rng.choice(valid_moves)
+
+def random_policy(state, valid_moves, ai_color, rng):
+    """Rollout policy: a uniformly random legal move."""
+    return rng.choice(valid_moves)
+
+def winblock_policy(state, valid_moves, ai_color, rng):
+    """Rollout policy: take an immediate win, else block an opponent line of four, else play randomly.
+
+    Wins and threats are read from the bitboards (see MoveOrdering), so no move is applied.
+    """
+    player = state.current_player
+    opponent = "white" if player == "black" else "black"
+    own_mask = state.masks[player]
+    for move in valid_moves:
+        if is_winning_move(move, own_mask):
+            return move
+
+    blocks = threat_mask(state.masks[opponent], state.occupied_mask)
+    if blocks:
+        blocking = [move for move in valid_moves if blocks & TILE_MASK[move[-1]]]
+        if blocking:
+            return rng.choice(blocking)
+    return rng.choice(valid_moves)
+
+# (position hash, last move destination, ai_color) -> evaluate_board score
+_eval_cache = {}
+
+def _cached_evaluation(state, move, ai_color):
+    """evaluate_board after move, memoized by position hash."""
+    # The win check only depends on where the last move landed
+    key = (state.hash, move[-1] if move[0] == "move" else None, ai_color)
+    score = _eval_cache.get(key)
+    if score is None:
+        if len(_eval_cache) >= EVAL_CACHE_SIZE:
+            _eval_cache.clear()
+        score = state.evaluate_board(move, ai_color)
+        _eval_cache[key] = score
+    return score
+
+def epsilon_greedy_policy(state, valid_moves, ai_color, rng):
+    """Rollout policy: a random move with probability EPSILON, else the best move by cached evaluation."""
+    if rng.random() < EPSILON:
+        return rng.choice(valid_moves)
+
+    maximizing = state.current_player == ai_color
+    best_move = None
+    best_score = None
+    for move in valid_moves:
+        undo_token = state.apply(move)
+        score = _cached_evaluation(state, move, ai_color)
+        state.undo(undo_token)
+        if best_score is None or (score > best_score if maximizing else score < best_score):
+            best_score = score
+            best_move = move
+    return best_move
+
+def heuristic_policy(state, valid_moves, ai_color, rng):
+    """Rollout policy: the full choose_move heuristic (slowest, strongest)."""
+    return choose_move(state, ai_color, rng)
+
+# Rollout policies selectable by name, from strongest and slowest to weakest and fastest
+ROLLOUT_POLICIES = {
+    "heuristic": heuristic_policy,
+    "epsilon": epsilon_greedy_policy,
+    "winblock": winblock_policy,
+    "random": random_policy,
+}
+
+def heuristic_rollout(state, rollout_depth, ai_color, last_move=None, rng=random, policy="heuristic"):
+    """Simulate game from current state using a rollout policy.
+
+    Args:
+        state: Starting game state
+        rollout_depth: Maximum moves to simulate
+        ai_color: AI's color for evaluation
+        last_move: Move that led to current state
+        rng: Random generator used by the rollout policy
+        policy: Name of the rollout policy in ROLLOUT_POLICIES
+
+    Returns:
+        Final heuristic evaluation of simulated game state
+    """
+    choose = ROLLOUT_POLICIES[policy]
+    current_state = state.copy_state()
+    rollout_last_move = last_move
+
+    for _ in range(rollout_depth):
+        if current_state.is_game_over(rollout_last_move):
+            break
+
+        valid_moves = current_state.get_valid_plays()
+        if not valid_moves:
+            break
+
+        move = choose(current_state, valid_moves, ai_color, rng)
+        rollout_last_move = move
+
+        # The rollout owns its copy, so moves are applied in place without undo.
+        current_state.apply(move)
+
+    return current_state.evaluate_board(rollout_last_move, ai_color)
+
+def _leaf_rollout(state, rollout_depth, ai_color, last_move, seed, policy):
+    """Worker task for leaf parallelization: one rollout with its own seeded generator."""
+    return heuristic_rollout(state, rollout_depth, ai_color, last_move, random.Random(seed), policy)
+
+def _rollout_rewards(state, last_move, batch, rollout_depth, ai_color, rng, executor, policy):
+    """Rewards of the rollouts from one leaf: one in this process, or a batch in the executor."""
+    if executor is None:
+        return [heuristic_rollout(state, rollout_depth, ai_color, last_move, rng, policy)]
+    seeds = [rng.randrange(SEED_RANGE) for _ in range(batch)]
+    return list(executor.map(
+        _leaf_rollout, [state] * batch, [rollout_depth] * batch,
+        [ai_color] * batch, [last_move] * batch, seeds, [policy] * batch))
+
+def _grow_tree(root_node, num_simulations, rollout_depth, ai_color, rng, executor=None, batch_size=1,
+               policy="heuristic", c_param=math.sqrt(2), deadline=None, stop_event=None, stats=None):
+    """Run MCTS iterations on a tree, adding to the statistics it already has.
+
+    Args:
+        root_node: Root MCTSNode (a fresh one, or a subtree kept from an earlier search)
+        num_simulations: Number of rollouts to run
+        rollout_depth: Maximum moves per rollout
+        ai_color: AI's color for evaluation
+        rng: Random generator for expansion and rollouts
+        executor: Optional process pool; with it, batch_size rollouts of the
+            selected leaf run in the pool at once
+        batch_size: Rollouts per selected leaf when an executor is given
+        policy: Name of the rollout policy in ROLLOUT_POLICIES
+        c_param: UCT exploration constant
+        deadline: Optional time.perf_counter() value after which no new iteration starts
+        stop_event: Optional threading.Event; no new iteration starts once it is set
+        stats: Optional SearchStats to record simulations, tree depth and phase times in
+
+    Returns:
+        Root MCTSNode of the tree
+    """
+    simulations = 0
+
+    while simulations < num_simulations:
+        if deadline is not None and simulations and time.perf_counter() > deadline:
+            break
+        if stop_event is not None and stop_event.is_set():
+            break
+        if stats is not None:
+            started = time.perf_counter()
+        node = root_node
+        depth = 0
+
+        # Selection: traverse using best_child until reaching a node that is not fully expanded.
+        while node.is_fully_expanded() and node.children:
+            node = node.best_child(c_param)
+            depth += 1
+        if stats is not None:
+            selected = time.perf_counter()
+
+        # Expansion: expand the node if it's not fully expanded.
+        if not node.is_fully_expanded():
+            node = node.expand(rng)
+            depth += 1
+        if stats is not None:
+            expanded = time.perf_counter()
+
+        # Simulation: perform heuristic rollouts from the node's state.
+        rewards = _rollout_rewards(node.state, node.last_move, min(batch_size, num_simulations - simulations),
+                                   rollout_depth, ai_color, rng, executor, policy)
+        simulations += len(rewards)
+        if stats is not None:
+            rolled_out = time.perf_counter()
+
+        # Backpropagation: update the node and its ancestors with the simulation results.
+        while node is not None:
+            for reward in rewards:
+                node.update(reward)
+            node = node.parent
+
+        if stats is not None:
+            _record_iteration(stats, len(rewards), depth, started, selected, expanded, rolled_out)
+
+    return root_node
+
+def _record_iteration(stats, rollouts, depth, started, selected, expanded, rolled_out):
+    """Add one MCTS iteration, timed at the end of each phase, to stats."""
+    phases = stats.phase_seconds
+    phases["selection"] += selected - started
+    phases["expansion"] += expanded - selected
+    phases["rollout"] += rolled_out - expanded
+    phases["backprop"] += time.perf_counter() - rolled_out
+    stats.simulations += rollouts
+    if depth > stats.max_tree_depth:
+        stats.max_tree_depth = depth
+
+def encode_move(move):
+    """Pack a move into an int: placements are 0..24, piece moves 25 + from * 25 + to."""
+    if move[0] == "place":
+        return TILE_INDEX[move[1]]
+    return 25 + TILE_INDEX[move[1]] * 25 + TILE_INDEX[move[2]]
+
+def decode_move(code):
+    """Inverse of encode_move."""
+    if code < 25:
+        return ("place", BOARD_TILES[code])
+    source, dest = divmod(code - 25, 25)
+    return ("move", BOARD_TILES[source], BOARD_TILES[dest])
+
+class ArrayTree:
+    """MCTS tree stored as flat arrays instead of MCTSNode objects.
+
+    A node is an index into the arrays and the children of a node sit in one
+    contiguous block. Nodes keep only the code of the move reaching them:
+    states are rebuilt by replaying moves from the root during selection,
+    and a node's moves are generated the first time the search goes through it.
+    Once max_nodes is reached the tree stops growing and rolls out from its leaves.
+
+    Child selection reads the statistics of a whole child block at once, with
+    NumPy when it is installed and the block is large enough.
+    """
+    def __init__(self, state, max_nodes=1000000, c_param=math.sqrt(2), fpu=None, vectorized=True):
+        """
+        Args:
+            state: Root game state (copied)
+            max_nodes: Node capacity of the tree
+            c_param: UCT exploration constant
+            fpu: First-play urgency, the UCT score given to unvisited children. None tries
+                every child once before any is revisited (plain UCT)
+            vectorized: Use NumPy for selection when available
+        """
+        self.root_state = state.copy_state()
+        self.max_nodes = max_nodes
+        self.c_param = c_param
+        self.fpu = fpu
+        self.vectorized = vectorized and np is not None
+        self.visits = array('i', [0])
+        self.rewards = array('d', [0.0])
+        self.parent = array('i', [-1])
+        self.first_child = array('i', [-1])  # -1 until the node's moves are generated
+        self.child_count = array('i', [0])
+        self.tried = array('i', [0])  # children first..first+tried-1 have been visited
+        self.move = array('H', [0])
+
+    def __len__(self):
+        return len(self.visits)
+
+    def _generate_children(self, node, state):
+        """Allocate the child block of node. Returns False if it does not fit in max_nodes."""
+        moves = state.get_valid_plays()
+        first = len(self.visits)
+        count = len(moves)
+        if first + count > self.max_nodes:
+            return False
+        self.visits.extend([0] * count)
+        self.rewards.extend([0.0] * count)
+        self.parent.extend([node] * count)
+        self.first_child.extend([-1] * count)
+        self.child_count.extend([0] * count)
+        self.tried.extend([0] * count)
+        self.move.extend([encode_move(move) for move in moves])
+        self.first_child[node] = first
+        self.child_count[node] = count
+        return True
+
+    def _select_child(self, node):
+        """UCT choice among the visited children of node.
+
+        Returns:
+            int: Index of the chosen child, or -1 to expand an untried child instead
+        """
+        tried = self.tried[node]
+        untried = tried < self.child_count[node]
+        if untried and (self.fpu is None or not tried):
+            return -1
+
+        parent_visits = self.visits[node]
+        if parent_visits < UCT_TABLE_SIZE:
+            explore = self.c_param * SQRT_LOG_TABLE[parent_visits]
+        else:
+            explore = self.c_param * math.sqrt(math.log(parent_visits))
+        first = self.first_child[node]
+
+        if self.vectorized and tried >= VECTOR_MIN_CHILDREN:
+            visits = np.frombuffer(self.visits, dtype=np.intc)[first:first + tried]
+            scores = np.frombuffer(self.rewards)[first:first + tried] / visits + explore / np.sqrt(visits)
+            best = int(scores.argmax())
+            best_child = first + best
+            best_score = scores[best]
+        else:
+            visits = self.visits
+            rewards = self.rewards
+            inv_sqrt = INV_SQRT_TABLE
+            best_child = first
+            best_score = -float('inf')
+            for child in range(first, first + tried):
+                child_visits = visits[child]
+                if child_visits < UCT_TABLE_SIZE:
+                    score = rewards[child] / child_visits + explore * inv_sqrt[child_visits]
+                else:
+                    score = rewards[child] / child_visits + explore / math.sqrt(child_visits)
+                if score > best_score:
+                    best_score = score
+                    best_child = child
+
+        if untried and self.fpu >= best_score:
+            return -1
+        return best_child
+
+    def grow(self, num_simulations, rollout_depth, ai_color, rng=random, executor=None, batch_size=1,
+             policy="heuristic", deadline=None, stop_event=None, stats=None):
+        """Run MCTS iterations, with the same arguments as _grow_tree.
+
+        In stats, generating a node's moves counts as expansion and the rest of
+        the descent as selection.
+        """
+        simulations = 0
+        while simulations < num_simulations:
+            if deadline is not None and simulations and time.perf_counter() > deadline:
+                break
+            if stop_event is not None and stop_event.is_set():
+                break
+            if stats is not None:
+                started = time.perf_counter()
+                expansion = 0.0
+            state = self.root_state.copy_state()
+            node = 0
+            depth = 0
+            last_move = None
+
+            # Selection and expansion, replaying the moves on state on the way down
+            while True:
+                if self.first_child[node] < 0:
+                    if stats is not None:
+                        generating = time.perf_counter()
+                    generated = self._generate_children(node, state)
+                    if stats is not None:
+                        expansion += time.perf_counter() - generating
+                    if not generated:
+                        break  # tree is full: roll out from this leaf
+                count = self.child_count[node]
+                if not count:
+                    break
+                child = self._select_child(node)
+                expanding = child < 0
+                if expanding:
+                    # Swap a random untried move into the next slot (untried nodes have no subtree)
+                    tried = self.tried[node]
+                    child = self.first_child[node] + tried
+                    pick = child + rng.randrange(count - tried)
+                    self.move[pick], self.move[child] = self.move[child], self.move[pick]
+                    self.tried[node] = tried + 1
+                node = child
+                depth += 1
+                last_move = decode_move(self.move[node])
+                state.apply(last_move)
+                if expanding:
+                    break
+            if stats is not None:
+                expanded = time.perf_counter()
+
+            rewards = _rollout_rewards(state, last_move, min(batch_size, num_simulations - simulations),
+                                       rollout_depth, ai_color, rng, executor, policy)
+            simulations += len(rewards)
+            if stats is not None:
+                rolled_out = time.perf_counter()
+
+            # Backpropagation
+            total = sum(rewards)
+            while node >= 0:
+                self.visits[node] += len(rewards)
+                self.rewards[node] += total
+                node = self.parent[node]
+
+            if stats is not None:
+                _record_iteration(stats, len(rewards), depth, started, expanded - expansion, expanded, rolled_out)
+
+    def root_visits(self):
+        """(move, visits) of every visited root move."""
+        first = self.first_child[0]
+        return [(decode_move(self.move[child]), self.visits[child])
+                for child in range(first, first + self.tried[0])]
+
+    def best_move(self):
+        """Most visited root move, or None before any search."""
+        root_visits = self.root_visits()
+        if not root_visits:
+            return None
+        return max(root_visits, key=lambda item: item[1])[0]
+
+def _root_visits(state, num_simulations, rollout_depth, ai_color, seed, policy, tree, c_param, fpu, deadline,
+                 collect_stats):
+    """Worker task for root parallelization: grow an independent tree.
+
+    Returns:
+        tuple: (root visit counts as (move, visits) pairs, SearchStats or None)
+    """
+    stats = SearchStats() if collect_stats else None
+    if tree == "array":
+        array_tree = ArrayTree(state, c_param=c_param, fpu=fpu)
+        array_tree.grow(num_simulations, rollout_depth, ai_color, random.Random(seed), policy=policy,
+                        deadline=deadline, stats=stats)
+        return array_tree.root_visits(), stats
+    root_node = _grow_tree(MCTSNode(state), num_simulations, rollout_depth, ai_color, random.Random(seed),
+                           policy=policy, c_param=c_param, deadline=deadline, stats=stats)
+    return [(child.move, child.visits) for child in root_node.children], stats
+
+def montecarlo(state, num_simulations, rollout_depth, ai_color, parallel=None, workers=None, seed=None,
+               rollout_policy="heuristic", tree="nodes", c_param=math.sqrt(2), fpu=None, time_budget_ms=None,
+               stop_event=None, stats=None, executor=None):
+    """Execute Monte Carlo Tree Search algorithm.
+
+    Process:
+    1. Selection: Traverse tree using UCT
+    2. Expansion: Add new node if possible
+    3. Simulation: Rollout game from expanded node
+    4. Backpropagation: Update node statistics
+
+    Args:
+        state: Current game state
+        num_simulations: Rollouts per tree: every worker of root parallelization runs this many,
+            leaf parallelization shares them between its workers
+        rollout_depth: Maximum moves per rollout
+        ai_color: AI's color for evaluation
+        parallel: None for a single serial tree,
+            "root" for one independent tree per worker with their root visit counts summed,
+            "leaf" for a single tree whose selected leaves get a batch of rollouts in the workers
+        workers: Number of worker processes (defaults to the CPU count)
+        seed: Optional seed; with it the result is reproducible (each worker gets its own derived seed)
+        rollout_policy: "heuristic" (choose_move at every ply), "epsilon" (epsilon-greedy on a
+            cached evaluation), "winblock" (win/block check, else random) or "random"
+        tree: "nodes" for a tree of MCTSNode objects, "array" for the compact ArrayTree
+        c_param: UCT exploration constant
+        fpu: First-play urgency for unvisited children (array tree only, see ArrayTree)
+        time_budget_ms: Optional time limit; the search stops early (after at least one
+            simulation) once it is spent
+        stop_event: Optional threading.Event to stop the search from another thread (not
+            seen by the worker processes of root parallelization)
+        stats: Optional SearchStats filled in with simulations, tree depth, phase times and elapsed time
+        executor: Optional ProcessPoolExecutor for the parallel modes, kept running afterwards
+            (without it each call starts and shuts down a pool of its own)
+
+    Returns:
+        Best move found through MCTS process
+    """
+    if rollout_policy not in ROLLOUT_POLICIES:
+        raise ValueError(f"Unknown rollout policy: {rollout_policy}")
+    if tree not in ("nodes", "array"):
+        raise ValueError(f"Unknown MCTS tree storage: {tree}")
+    rng = random.Random(seed) if seed is not None else random
+    workers = workers or os.cpu_count() or 1
+    deadline = None
+    if time_budget_ms is not None:
+        deadline = time.perf_counter() + time_budget_ms / 1000.0
+
+    started = time.perf_counter()
+    try:
+        return _search(state, num_simulations, rollout_depth, ai_color, parallel, workers, rng, rollout_policy, tree,
+                       c_param, fpu, deadline, stop_event, stats, executor)
+    finally:
+        if stats is not None:
+            stats.elapsed += time.perf_counter() - started
+
+def _pool(executor, workers):
+    """Context manager for the pool of a parallel search: the caller's executor (left running), or a new pool."""
+    if executor is not None:
+        return nullcontext(executor)
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def _search(state, num_simulations, rollout_depth, ai_color, parallel, workers, rng, rollout_policy, tree, c_param,
+            fpu, deadline, stop_event, stats, executor):
+    """Body of montecarlo, once its arguments are resolved."""
+    if tree == "array" and parallel != "root":
+        array_tree = ArrayTree(state, c_param=c_param, fpu=fpu)
+        if parallel is None:
+            array_tree.grow(num_simulations, rollout_depth, ai_color, rng, policy=rollout_policy, deadline=deadline,
+                            stop_event=stop_event, stats=stats)
+        elif parallel == "leaf":
+            with _pool(executor, workers) as pool:
+                array_tree.grow(num_simulations, rollout_depth, ai_color, rng,
+                                executor=pool, batch_size=workers, policy=rollout_policy, deadline=deadline,
+                                stop_event=stop_event, stats=stats)
+        else:
+            raise ValueError(f"Unknown MCTS parallel mode: {parallel}")
+        return array_tree.best_move()
+
+    if parallel is None:
+        root_node = _grow_tree(MCTSNode(state), num_simulations, rollout_depth, ai_color, rng,
+                               policy=rollout_policy, c_param=c_param, deadline=deadline, stop_event=stop_event,
+                               stats=stats)
+    elif parallel == "leaf":
+        with _pool(executor, workers) as pool:
+            root_node = _grow_tree(MCTSNode(state), num_simulations, rollout_depth, ai_color, rng,
+                                   executor=pool, batch_size=workers, policy=rollout_policy, c_param=c_param,
+                                   deadline=deadline, stop_event=stop_event, stats=stats)
+    elif parallel == "root":
+        seeds = [rng.randrange(SEED_RANGE) for _ in range(workers)]
+        # Each tree gets the whole budget: splitting it leaves every tree too shallow
+        # to rank the root moves, and the summed visits end up close to uniform
+        with _pool(executor, workers) as pool:
+            results = list(pool.map(
+                _root_visits, [state] * workers, [num_simulations] * workers, [rollout_depth] * workers, [ai_color] * workers, seeds,
+                [rollout_policy] * workers, [tree] * workers, [c_param] * workers, [fpu] * workers,
+                [deadline] * workers, [stats is not None] * workers))
+
+        visits = {}
+        for result, worker_stats in results:
+            for move, count in result:
+                visits[move] = visits.get(move, 0) + count
+            if stats is not None:
+                stats.merge(worker_stats)
+        if not visits:
+            return None
+        # Ties go to the first move in generation order, so the merge does not depend on worker timing
+        return max(state.get_valid_plays(), key=lambda move: visits.get(move, 0))
+    else:
+        raise ValueError(f"Unknown MCTS parallel mode: {parallel}")
+
+    if not root_node.children:
+        return None  # stopped before the first simulation
+    best_move = max(root_node.children, key=lambda child: child.visits).move
+    return best_move
+
+class MCTSEngine:
+    """MCTS player that keeps its tree between turns.
+
+    After each search the chosen child becomes the root. On the next call the
+    opponent's reply is looked up among that node's children by position hash
+    and promoted to the root, so the statistics gathered for it are reused and
+    the rest of the old tree is dropped.
+    """
+    def __init__(self, rollout_depth, ai_color, rollout_policy="heuristic", seed=None):
+        """
+        Args:
+            rollout_depth: Maximum moves per rollout
+            ai_color: Color the engine plays (tree rewards are from its point of view)
+            rollout_policy: Name of the rollout policy in ROLLOUT_POLICIES
+            seed: Optional seed for reproducible searches
+        """
+        if rollout_policy not in ROLLOUT_POLICIES:
+            raise ValueError(f"Unknown rollout policy: {rollout_policy}")
+        self.rollout_depth = rollout_depth
+        self.ai_color = ai_color
+        self.rollout_policy = rollout_policy
+        self.rng = random.Random(seed) if seed is not None else random
+        self.root = None
+
+    def reset(self):
+        """Forget the kept tree (e.g. for a new game)."""
+        self.root = None
+
+    def _root_for(self, state):
+        """Reuse the kept node matching state (the old root or one of its children), else start a new tree."""
+        if self.root is not None:
+            for node in [self.root] + self.root.children:
+                if node.state.hash == state.hash and node.state.masks == state.masks:
+                    node.parent = None  # prune: backpropagation stops here and the old tree is freed
+                    return node
+        return MCTSNode(state.copy_state())
+
+    def choose_move(self, state, num_simulations, stop_event=None, stats=None):
+        """Search state and return the best move, keeping the chosen subtree for the next call.
+
+        Args:
+            state: Current game state (ai_color to move)
+            num_simulations: Rollouts to add to the tree this turn
+            stop_event: Optional threading.Event to cut the search short from another thread
+            stats: Optional SearchStats to record this turn's search in
+
+        Returns:
+            Best move found, or None if there is no legal move
+        """
+        started = time.perf_counter()
+        root_node = self._root_for(state)
+        _grow_tree(root_node, num_simulations, self.rollout_depth, self.ai_color, self.rng,
+                   policy=self.rollout_policy, stop_event=stop_event, stats=stats)
+        if stats is not None:
+            stats.elapsed += time.perf_counter() - started
+        if not root_node.children:
+            self.root = None
+            return None
+
+        best_child = max(root_node.children, key=lambda child: child.visits)
+        self.root = best_child
+        return best_child.move
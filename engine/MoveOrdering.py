@@ -0,0 +1,93 @@
+from .BoardGeometry import LINES_4, LINES_4_THROUGH, TILE_MASK
+
+# Ordering tiers, from first searched to last; history scores stay far below them
+WIN_SCORE = 5 << 40
+BLOCK_SCORE = 4 << 40
+TT_SCORE = 3 << 40
+KILLER_SCORE = 2 << 40
+
+
+def _popcount(mask):
+    return bin(mask).count("1")
+
+
+def threat_mask(color_mask, occupied_mask):
+    """Empty tiles that would complete a line of four for a color.
+
+    Only the line itself is checked, not whether a piece can reach the tile,
+    which keeps this cheap enough to run at every node.
+    """
+    threats = 0
+    for line_mask, ends_mask in LINES_4:
+        if _popcount(color_mask & line_mask) == 3 and not color_mask & ends_mask:
+            threats |= line_mask & ~occupied_mask
+    return threats
+
+
+def is_winning_move(move, own_mask):
+    """Check whether a move lines up exactly four, ignoring the pieces it would flip."""
+    if move[0] != "move":
+        return False  # placements never win
+    _, piece_pos, new_tile = move
+    after = (own_mask & ~TILE_MASK[piece_pos]) | TILE_MASK[new_tile]
+    for line_mask, ends_mask in LINES_4_THROUGH[new_tile]:
+        if after & line_mask == line_mask and not after & ends_mask:
+            return True
+    return False
+
+
+class MoveOrderer:
+    """Orders moves for alpha-beta so the likely best ones are searched first.
+
+    Tiers: immediate wins and forced blocks, then the transposition-table move,
+    then the killer moves of the ply, then the history-heuristic score.
+    """
+
+    def __init__(self, max_ply=64):
+        self.killers = [[None, None] for _ in range(max_ply)]
+        self.history = {}
+
+    def order(self, state, moves, ply, tt_move=None):
+        """Sort moves in place, best candidates first.
+
+        Args:
+            state: GameState the moves belong to
+            moves: List of legal moves for state.current_player
+            ply: Distance from the search root
+            tt_move: Best move stored in the transposition table, if any
+        """
+        player = state.current_player
+        opponent = "white" if player == "black" else "black"
+        own_mask = state.masks[player]
+        blocks = threat_mask(state.masks[opponent], state.occupied_mask)
+        killers = self.killers[ply] if ply < len(self.killers) else (None, None)
+        history = self.history
+
+        def score(move):
+            if is_winning_move(move, own_mask):
+                return WIN_SCORE
+            if blocks & TILE_MASK[move[-1]]:
+                return BLOCK_SCORE
+            if move == tt_move:
+                return TT_SCORE
+            if move == killers[0] or move == killers[1]:
+                return KILLER_SCORE
+            return history.get((player, move), 0)
+
+        moves.sort(key=score, reverse=True)
+
+    def record_cutoff(self, move, ply, depth, player):
+        """Remember a move that caused a beta cutoff.
+
+        Args:
+            move: The refuting move
+            ply: Distance from the search root
+            depth: Remaining depth of the cutoff node (deeper cutoffs weigh more)
+            player: Color that played the move
+        """
+        if ply < len(self.killers):
+            killers = self.killers[ply]
+            if killers[0] != move:
+                killers[1] = killers[0]
+                killers[0] = move
+        self.history[(player, move)] = self.history.get((player, move), 0) + depth * depth
@@ -0,0 +1,143 @@
+"""Opening book: precomputed minimax answers for the first placements.
+
+The book is a binary file of fixed-size records sorted by key. The key is the
+symmetry-independent position hash from Symmetry.canonical_key, so each of the
+up to four symmetric images of a position shares one record. Moves are stored
+in the canonical frame and mapped back on lookup. The file is memory-mapped and
+binary searched: opening a book reads no records, and a lookup reads about
+log2(records) of them.
+
+Build a book offline with `python -m engine.OpeningBook --plies 2 --depth 5`.
+"""
+import argparse
+import mmap
+import os
+import struct
+from .GameState import GameState
+from .MonteCarlo import decode_move, encode_move
+from .MoveOrdering import MoveOrderer
+from .Symmetry import canonical_key, from_canonical_move, to_canonical_move
+from .TranspositionTable import TranspositionTable
+from .minimax import SearchContext, minimax
+
+DEFAULT_BOOK_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "books",
+                                 "opening.book")
+
+FILE_HEADER = struct.Struct("<4sBBBxI")  # magic, version, plies, depth, record count
+RECORD = struct.Struct("<QHh")  # canonical key, move code (canonical frame), score for the side to move
+FILE_MAGIC = b"YMOB"
+FILE_VERSION = 1
+SCORE_LIMIT = 32767
+
+
+class OpeningBook:
+    """Read-only view of a book file."""
+
+    def __init__(self, path=DEFAULT_BOOK_PATH):
+        """Map a book file into memory.
+
+        Args:
+            path: Book file written by build_book
+
+        Raises:
+            ValueError: If the file is not an opening book
+        """
+        with open(path, "rb") as book_file:
+            self.data = mmap.mmap(book_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.plies, self.depth, self.size = FILE_HEADER.unpack_from(self.data)
+        if magic != FILE_MAGIC or version != FILE_VERSION:
+            raise ValueError(f"Not an opening book: {path}")
+
+    def probe(self, state):
+        """Look up the book move for a position.
+
+        Returns:
+            tuple/None: (move, score for the side to move), or None if the position is not in the book
+        """
+        key, symmetry = canonical_key(state)
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            record_key, code, score = RECORD.unpack_from(self.data, FILE_HEADER.size + middle * RECORD.size)
+            if record_key < key:
+                low = middle + 1
+            elif record_key > key:
+                high = middle
+            else:
+                return from_canonical_move(decode_move(code), symmetry), score
+        return None
+
+    def close(self):
+        self.data.close()
+
+
+def book_positions(plies):
+    """Positions after up to `plies` placements from the start, one per symmetry class.
+
+    Returns:
+        list: GameState objects, in the order the placement tree is walked
+    """
+    positions = []
+    seen = set()
+    frontier = [GameState()]
+    for ply in range(plies + 1):
+        next_frontier = []
+        for state in frontier:
+            key, _ = canonical_key(state)
+            if key in seen:
+                continue
+            seen.add(key)
+            positions.append(state)
+            if ply < plies:
+                for move in state.get_valid_plays():
+                    if move[0] == "place":
+                        child = state.copy_state()
+                        child.apply(move)
+                        next_frontier.append(child)
+        frontier = next_frontier
+    return positions
+
+
+def build_book(path, plies=2, depth=5, on_progress=None):
+    """Search every book position with a fixed-depth minimax and write the book file.
+
+    Args:
+        path: Output file
+        plies: Placements from the start covered by the book
+        depth: Minimax depth of every entry
+        on_progress: Optional callback(done, total)
+
+    Returns:
+        int: Number of records written
+    """
+    records = {}
+    positions = book_positions(plies)
+    for done, state in enumerate(positions, 1):
+        context = SearchContext(TranspositionTable(), orderer=MoveOrderer())
+        score, move = minimax(state.copy_state(), depth, float('-inf'), float('inf'), True, None,
+                              state.current_player, context)
+        if move is not None:
+            key, symmetry = canonical_key(state)
+            score = int(max(-SCORE_LIMIT, min(SCORE_LIMIT, score)))
+            records[key] = (encode_move(to_canonical_move(move, symmetry)), score)
+        if on_progress is not None:
+            on_progress(done, len(positions))
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "wb") as book_file:
+        book_file.write(FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION, plies, depth, len(records)))
+        for key in sorted(records):
+            book_file.write(RECORD.pack(key, *records[key]))
+    return len(records)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the Yonmoque-Hex opening book")
+    parser.add_argument("--plies", type=int, default=2, help="placements from the start covered by the book")
+    parser.add_argument("--depth", type=int, default=5, help="minimax depth of every entry")
+    parser.add_argument("--output", default=DEFAULT_BOOK_PATH)
+    args = parser.parse_args()
+
+    count = build_book(args.output, args.plies, args.depth,
+                       on_progress=lambda done, total: print(f"{done}/{total}", end="\r", flush=True))
+    print(f"\n{count} positions written to {args.output}")
@@ -0,0 +1,85 @@
+MCTS_PHASES = ("selection", "expansion", "rollout", "backprop")
+
+
+class SearchStats:
+    """Opt-in counters filled in by the searches.
+
+    Pass an instance with stats=... to minimax (through SearchContext),
+    iterative_deepening, montecarlo or MCTSEngine.choose_move and read it
+    back next to the move. Searches given no stats object skip all of this
+    bookkeeping.
+    """
+
+    def __init__(self):
+        # Minimax
+        self.nodes = 0
+        self.leaf_evals = 0
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0  # cutoffs by the first move searched (move ordering quality)
+        self.cutoff_plies = {}  # ply -> number of cutoffs at that distance from the root
+        self.iteration_nodes = []  # nodes searched by each completed iterative deepening iteration
+        self.depth = 0  # deepest completed minimax iteration
+
+        # MCTS
+        self.simulations = 0
+        self.max_tree_depth = 0
+        self.phase_seconds = dict.fromkeys(MCTS_PHASES, 0.0)
+
+        self.elapsed = 0.0  # wall-clock seconds of the search
+
+    def record_cutoff(self, ply, first_move):
+        self.cutoffs += 1
+        if first_move:
+            self.first_move_cutoffs += 1
+        self.cutoff_plies[ply] = self.cutoff_plies.get(ply, 0) + 1
+
+    def merge(self, other):
+        """Add the counters of another SearchStats (e.g. from a worker process)."""
+        for name in ("nodes", "leaf_evals", "tt_probes", "tt_hits", "cutoffs", "first_move_cutoffs",
+                     "simulations"):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        for ply, count in other.cutoff_plies.items():
+            self.cutoff_plies[ply] = self.cutoff_plies.get(ply, 0) + count
+        for phase, seconds in other.phase_seconds.items():
+            self.phase_seconds[phase] += seconds
+        self.max_tree_depth = max(self.max_tree_depth, other.max_tree_depth)
+
+    @property
+    def effective_branching_factor(self):
+        """Growth of the node count from one iteration to the next (or nodes ** (1 / depth))."""
+        if len(self.iteration_nodes) >= 2 and self.iteration_nodes[-2]:
+            return self.iteration_nodes[-1] / self.iteration_nodes[-2]
+        if self.depth and self.nodes:
+            return self.nodes ** (1.0 / self.depth)
+        return None
+
+    @property
+    def nodes_per_second(self):
+        return self.nodes / self.elapsed if self.elapsed else None
+
+    @property
+    def rollouts_per_second(self):
+        return self.simulations / self.elapsed if self.elapsed else None
+
+    def as_dict(self):
+        """Plain dict of every counter and derived rate (e.g. for JSON)."""
+        return {
+            "nodes": self.nodes,
+            "leaf_evals": self.leaf_evals,
+            "tt_probes": self.tt_probes,
+            "tt_hits": self.tt_hits,
+            "cutoffs": self.cutoffs,
+            "first_move_cutoffs": self.first_move_cutoffs,
+            "cutoff_plies": {str(ply): count for ply, count in sorted(self.cutoff_plies.items())},
+            "iteration_nodes": list(self.iteration_nodes),
+            "depth": self.depth,
+            "effective_branching_factor": self.effective_branching_factor,
+            "nodes_per_second": self.nodes_per_second,
+            "simulations": self.simulations,
+            "rollouts_per_second": self.rollouts_per_second,
+            "max_tree_depth": self.max_tree_depth,
+            "phase_seconds": dict(self.phase_seconds),
+            "elapsed": self.elapsed,
+        }
@@ -0,0 +1,104 @@
+"""Symmetries of the Yonmoque-Hex board.
+
+A transform must keep the tile colors and map the three hex axes (0, 1),
+(1, 0) and (1, -1) onto each other. Of the eight symmetries of the square,
+only four do that: the two quarter turns (and the two axis reflections) send
+the (1, -1) axis to (1, 1), which is not a board line. Every transform below
+is its own inverse.
+
+Tables keyed by canonical_key (the opening book, and the transposition table
+of a search run with symmetric_tt) store one entry per symmetry class, up to
+four times fewer than with GameState.hash. Moves stored with such a key are
+kept in the canonical frame: to_canonical_move on the way in, from_canonical_move
+on the way out.
+"""
+from .BoardGeometry import BOARD_TILES, TILE_INDEX, iter_tiles
+from .GameState import ZOBRIST_PIECE, ZOBRIST_RESERVE, ZOBRIST_TURN, GameState
+
+SYMMETRIES = [
+    lambda x, y: (x, y),          # identity
+    lambda x, y: (6 - x, 6 - y),  # half turn
+    lambda x, y: (y, x),          # reflection in the x = y diagonal
+    lambda x, y: (6 - y, 6 - x),  # reflection in the x + y = 6 diagonal
+]
+
+# TILE_MAPS[s][tile]: image of a tile under symmetry s
+TILE_MAPS = [{tile: transform(*tile) for tile in BOARD_TILES} for transform in SYMMETRIES]
+# BIT_MAPS[s][i]: mask of the image of bit i under symmetry s
+BIT_MAPS = [[1 << TILE_INDEX[tile_map[tile]] for tile in BOARD_TILES] for tile_map in TILE_MAPS]
+# INVERSES[s]: the symmetry undoing s
+INVERSES = [next(t for t in range(len(TILE_MAPS)) if all(TILE_MAPS[t][TILE_MAPS[s][tile]] == tile
+                                                            for tile in BOARD_TILES))
+            for s in range(len(TILE_MAPS))]
+
+
+def transform_mask(mask, symmetry):
+    """Image of a board mask under a symmetry."""
+    bit_map = BIT_MAPS[symmetry]
+    image = 0
+    while mask:
+        low = mask & -mask
+        image |= bit_map[low.bit_length() - 1]
+        mask ^= low
+    return image
+
+
+def transform_move(move, symmetry):
+    """Image of a move under a symmetry."""
+    if move is None:
+        return None
+    tile_map = TILE_MAPS[symmetry]
+    return (move[0],) + tuple(tile_map[tile] for tile in move[1:])
+
+
+def to_canonical_move(move, symmetry):
+    """Map a move of a position into the frame of its canonical image (symmetry from canonical_key)."""
+    return transform_move(move, symmetry)
+
+
+def from_canonical_move(move, symmetry):
+    """Map a move stored in the canonical frame back onto the position."""
+    return transform_move(move, INVERSES[symmetry])
+
+
+def canonical_symmetry(state):
+    """Symmetry taking state to its canonical image: the one with the smallest (black mask, white mask)."""
+    black, white = state.masks["black"], state.masks["white"]
+    return min(range(len(SYMMETRIES)), key=lambda s: (transform_mask(black, s), transform_mask(white, s), s))
+
+
+def transform_state(state, symmetry):
+    """Image of a position under a symmetry, as a new GameState."""
+    tile_map = TILE_MAPS[symmetry]
+    data = state.to_dict()
+    for color in ("black", "white"):
+        data[color] = [list(tile_map[tuple(tile)]) for tile in data[color]]
+    return GameState.from_dict(data)
+
+
+def canonical_state(state):
+    """Canonical representative of a position's symmetry class.
+
+    Returns:
+        tuple: (canonical GameState, symmetry taking state to it)
+    """
+    symmetry = canonical_symmetry(state)
+    return transform_state(state, symmetry), symmetry
+
+
+def canonical_key(state):
+    """Zobrist hash shared by every symmetric image of a position.
+
+    Equal to canonical_state(state)[0].hash, without building the state.
+
+    Returns:
+        tuple: (canonical hash, symmetry taking state to its canonical image)
+    """
+    symmetry = canonical_symmetry(state)
+    tile_map = TILE_MAPS[symmetry]
+    key = ZOBRIST_TURN[state.current_player]
+    for color in ("black", "white"):
+        key ^= ZOBRIST_RESERVE[color][state.reserve[color]]
+        for tile in iter_tiles(state.masks[color]):
+            key ^= ZOBRIST_PIECE[color][tile_map[tile]]
+    return key, symmetry
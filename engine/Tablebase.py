@@ -0,0 +1,351 @@
+"""Endgame tablebase: perfect play for move-phase positions (both reserves empty).
+
+A table covers every position with a fixed number of pieces on the board, any
+split of colors and either side to move. Each position gets one byte:
+0 for a draw (neither side can force the game to end), an odd value for a
+win of the side to move and an even value for a loss, along with the number of
+plies until the game ends.
+
+Moves never add or remove pieces, so a table is closed under play and is solved
+on its own by retrograde analysis. A real game's endgame has all 12 pieces on
+the board, which is C(25, 12) * 2**12 * 2 (about 4.3e10) positions. That is far
+more than this pure-Python generator can solve, so tables are practical up to
+about 5 pieces. They cover composed positions (GameState.from_dict) and
+variants played with fewer pieces, never a position reached in a real game,
+so minimax and MCTS do not consult them: a table is an analysis tool, probed
+directly with probe and best_move.
+
+Generate a table with `python -m engine.Tablebase --pieces 4 --output yonmoque-4.tb`.
+"""
+import argparse
+import mmap
+import struct
+from array import array
+from .BoardGeometry import BOARD_TILES, LINES_4_THROUGH, LINES_5, RAYS, REACH, TILE_MASK, iter_tiles
+
+DRAW = "draw"
+WIN = "win"
+LOSS = "loss"
+
+# Minimax scores of solved positions: below the 9000 of a win on the board so a
+# win that is already there is still preferred, and shorter wins score higher
+TABLEBASE_WIN_SCORE = 8000
+
+MAX_DISTANCE = 127  # plies that fit in one byte next to the win/loss bit
+FILE_HEADER = struct.Struct("<4sBB")
+FILE_MAGIC = b"YMTB"
+FILE_VERSION = 1
+
+# BINOMIAL[n][k] = n choose k, for ranking the occupied tiles of a position
+BINOMIAL = [[0] * 27 for _ in range(27)]
+for _n in range(27):
+    BINOMIAL[_n][0] = 1
+    for _k in range(1, _n + 1):
+        BINOMIAL[_n][_k] = BINOMIAL[_n - 1][_k - 1] + BINOMIAL[_n - 1][_k]
+
+
+def position_index(black, white, white_to_move, pieces):
+    """Index of a position in a table of `pieces` pieces.
+
+    The occupied tiles are ranked in the combinatorial number system, then the
+    colors of the occupied tiles (in bit order) and the side to move are
+    appended as bits.
+    """
+    occupied = black | white
+    rank = 0
+    colors = 0
+    count = 0
+    while occupied:
+        low = occupied & -occupied
+        rank += BINOMIAL[low.bit_length() - 1][count + 1]
+        if white & low:
+            colors |= 1 << count
+        count += 1
+        occupied ^= low
+    return (((rank << pieces) | colors) << 1) | white_to_move
+
+
+def _loser(black, white):
+    """Color with five in a row, as GameState.check_lose (black is checked first)."""
+    for color, color_mask in (("black", black), ("white", white)):
+        for line_mask, _ in LINES_5:
+            if color_mask & line_mask == line_mask:
+                return color
+    return None
+
+
+def successors(black, white, white_to_move):
+    """Every move of the side to move, played on bitboards with the GameState rules.
+
+    Yields:
+        tuple: (move, black, white, outcome) where outcome is WIN or LOSS when the
+        move ends the game (from the mover's point of view), else None
+    """
+    player = "white" if white_to_move else "black"
+    own, opponent = (white, black) if white_to_move else (black, white)
+    occupied = black | white
+    for piece_pos in iter_tiles(own):
+        reach = 0
+        for ray_mask, destinations in REACH[player][piece_pos]:
+            reach |= destinations[occupied & ray_mask]
+        for new_tile in iter_tiles(reach):
+            new_own = own ^ TILE_MASK[piece_pos] | TILE_MASK[new_tile]
+            # Flip the opponent pieces between the moved piece and another own piece
+            flipped = 0
+            for ray in RAYS[new_tile]:
+                to_flip = 0
+                for _, tile_mask in ray:
+                    if opponent & tile_mask:
+                        to_flip |= tile_mask
+                    elif new_own & tile_mask:
+                        flipped |= to_flip
+                        break
+                    else:
+                        break
+            new_own |= flipped
+            new_opponent = opponent ^ flipped
+            new_black, new_white = (new_opponent, new_own) if white_to_move else (new_own, new_opponent)
+
+            outcome = None
+            loser = _loser(new_black, new_white)
+            if loser is not None:
+                outcome = LOSS if loser == player else WIN
+            else:
+                for line_mask, ends_mask in LINES_4_THROUGH[new_tile]:
+                    if new_own & line_mask == line_mask and not new_own & ends_mask:
+                        outcome = WIN
+                        break
+            yield ("move", piece_pos, new_tile), new_black, new_white, outcome
+
+
+def _positions(pieces):
+    """Every (black, white, white_to_move) of a table, in index order."""
+    for rank in range(BINOMIAL[len(BOARD_TILES)][pieces]):
+        bits = _unrank(rank, pieces)
+        for colors in range(1 << pieces):
+            black = white = 0
+            for position, bit in enumerate(bits):
+                if colors >> position & 1:
+                    white |= 1 << bit
+                else:
+                    black |= 1 << bit
+            yield black, white, 0
+            yield black, white, 1
+
+
+def _unrank(rank, pieces):
+    """Occupied bit numbers (ascending) of the subset with a given rank."""
+    bits = []
+    bit = len(BOARD_TILES)
+    for count in range(pieces, 0, -1):
+        bit -= 1
+        while BINOMIAL[bit][count] > rank:
+            bit -= 1
+        rank -= BINOMIAL[bit][count]
+        bits.append(bit)
+    return bits[::-1]
+
+
+class Tablebase:
+    """Solved table of the move-phase positions with a given number of pieces."""
+
+    def __init__(self, pieces, values, path=None):
+        """
+        Args:
+            pieces: Number of pieces on the board in every position of the table
+            values: One byte per position index (bytes, bytearray or mmap)
+            path: File the values were loaded from, if any (used when pickling)
+        """
+        self.pieces = pieces
+        self.values = values
+        self.path = path
+
+    @classmethod
+    def generate(cls, pieces, on_progress=None):
+        """Solve every position with `pieces` pieces by retrograde analysis.
+
+        Positions that end in a move's win or loss are resolved first, then
+        results are pushed back to the predecessors one distance at a time: a
+        position is won once any move reaches a position lost for the opponent,
+        and lost once every move reaches a position won for the opponent.
+        Positions left unresolved are draws.
+
+        Args:
+            pieces: Number of pieces on the board (1 to 12)
+            on_progress: Optional callback(phase, done, total)
+
+        Returns:
+            Tablebase: The solved table
+        """
+        size = BINOMIAL[len(BOARD_TILES)][pieces] << (pieces + 1)
+        values = bytearray(size)
+        distance = bytearray(size)
+        remaining = array('i', [0]) * size  # moves not yet known to lose, per unresolved position
+        edge_counts = array('I', [0]) * (size + 1)  # predecessors per position, then their offsets
+        edges = array('I')  # (position, successor) pairs of the moves that do not end the game
+        queue = array('I')
+
+        for index, (black, white, white_to_move) in enumerate(_positions(pieces)):
+            if _loser(black, white) is not None:
+                continue  # already over: never reached by a move
+            moves = 0  # moves that do not end the game (one that loses on the spot never helps)
+            has_moves = won = False
+            for _, new_black, new_white, outcome in successors(black, white, white_to_move):
+                has_moves = True
+                if outcome == WIN:
+                    won = True
+                    break
+                if outcome is None:
+                    moves += 1
+                    successor = position_index(new_black, new_white, white_to_move ^ 1, pieces)
+                    edges.append(index)
+                    edges.append(successor)
+                    edge_counts[successor] += 1
+            if won or (has_moves and not moves):
+                values[index] = 1 if won else 2
+                distance[index] = 1
+                queue.append(index)
+            else:
+                remaining[index] = moves  # a position with no legal move at all stays a draw
+            if on_progress is not None and index % 65536 == 0:
+                on_progress("moves", index, size)
+
+        # Predecessor lists as one flat array indexed by per-position offsets
+        offset = 0
+        for index in range(size + 1):
+            count = edge_counts[index]
+            edge_counts[index] = offset
+            offset += count
+        predecessors = array('I', [0]) * offset
+        fill = array('I', edge_counts)
+        for position in range(0, len(edges), 2):
+            successor = edges[position + 1]
+            predecessors[fill[successor]] = edges[position]
+            fill[successor] += 1
+        del edges, fill
+
+        head = 0
+        while head < len(queue):
+            index = queue[head]
+            head += 1
+            lost = values[index] == 2
+            next_distance = distance[index] + 1
+            for position in range(edge_counts[index], edge_counts[index + 1]):
+                predecessor = predecessors[position]
+                if values[predecessor]:
+                    continue
+                if lost:
+                    values[predecessor] = 1
+                elif remaining[predecessor] > 1:
+                    remaining[predecessor] -= 1
+                    continue
+                else:
+                    values[predecessor] = 2
+                if next_distance > MAX_DISTANCE:
+                    raise ValueError(f"Distance to result exceeds {MAX_DISTANCE} plies")
+                distance[predecessor] = next_distance
+                queue.append(predecessor)
+            if on_progress is not None and head % 65536 == 0:
+                on_progress("solve", head, size)
+
+        for index in range(size):
+            if values[index]:
+                values[index] = distance[index] * 2 - (values[index] & 1)
+        return cls(pieces, bytes(values))
+
+    def save(self, path):
+        """Write the table to a file (a short header followed by one byte per position)."""
+        with open(path, "wb") as table_file:
+            table_file.write(FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION, self.pieces))
+            table_file.write(self.values)
+
+    @classmethod
+    def load(cls, path):
+        """Memory-map a table written by save (pages are only read as they are probed)."""
+        with open(path, "rb") as table_file:
+            values = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, pieces = FILE_HEADER.unpack_from(values)
+        if magic != FILE_MAGIC or version != FILE_VERSION:
+            raise ValueError(f"Not a tablebase file: {path}")
+        return cls(pieces, memoryview(values)[FILE_HEADER.size:], path)
+
+    def __getstate__(self):
+        # Worker processes reopen a saved table instead of receiving a copy of it
+        if self.path is not None:
+            return {"pieces": self.pieces, "values": None, "path": self.path}
+        return {"pieces": self.pieces, "values": bytes(self.values), "path": None}
+
+    def __setstate__(self, data):
+        if data["values"] is None:
+            self.__dict__.update(Tablebase.load(data["path"]).__dict__)
+        else:
+            self.__dict__.update(data)
+
+    def covers(self, state):
+        """Whether state is a position of this table."""
+        return (not state.reserve["black"] and not state.reserve["white"]
+                and bin(state.occupied_mask).count("1") == self.pieces)
+
+    def probe(self, state):
+        """Perfect-play result of a position that is not already over.
+
+        Returns:
+            tuple/None: (WIN, LOSS or DRAW for the side to move, plies until the
+            game ends or None for a draw), or None if the table does not cover state
+        """
+        if not self.covers(state):
+            return None
+        value = self.values[position_index(state.masks["black"], state.masks["white"],
+                                           state.current_player == "white", self.pieces)]
+        if not value:
+            return DRAW, None
+        return (WIN if value & 1 else LOSS), (value + 1) // 2
+
+    def score(self, state, ai_color):
+        """probe as a minimax score from ai_color's point of view (None if not covered)."""
+        result = self.probe(state)
+        if result is None:
+            return None
+        outcome, distance = result
+        if outcome == DRAW:
+            return 0
+        if (outcome == WIN) == (state.current_player == ai_color):
+            return TABLEBASE_WIN_SCORE - distance
+        return distance - TABLEBASE_WIN_SCORE
+
+    def best_move(self, state):
+        """Move that keeps the perfect-play result: the fastest win, a draw, or the slowest loss.
+
+        Returns:
+            Move, or None if the table does not cover state or there is no legal move
+        """
+        if not self.covers(state):
+            return None
+        player = state.current_player
+        best_move, best_score = None, None
+        for move in state.get_valid_plays():
+            undo_token = state.apply(move)
+            if state.is_game_over(move):
+                score = -TABLEBASE_WIN_SCORE if state.check_lose() == player else TABLEBASE_WIN_SCORE
+            else:
+                score = self.score(state, player)
+            state.undo(undo_token)
+            if best_score is None or score > best_score:
+                best_move, best_score = move, score
+        return best_move
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a Yonmoque-Hex endgame tablebase")
+    parser.add_argument("--pieces", type=int, required=True, help="pieces on the board (practical up to 5)")
+    parser.add_argument("--output", required=True)
+    args = parser.parse_args()
+
+    table = Tablebase.generate(
+        args.pieces, on_progress=lambda phase, done, total: print(f"{phase}: {done}/{total}", flush=True))
+    table.save(args.output)
+    results = [0, 0, 0]
+    for value in table.values:
+        results[0 if not value else 1 if value & 1 else 2] += 1
+    print(f"{len(table.values)} positions: {results[1]} won, {results[2]} lost, {results[0]} drawn "
+          f"for the side to move")
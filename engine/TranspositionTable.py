@@ -0,0 +1,73 @@
+EXACT = 0        # score is the exact minimax value
+LOWER_BOUND = 1  # search failed high: the value is at least score
+UPPER_BOUND = 2  # search failed low: the value is at most score
+
+
+class TranspositionTable:
+    """Fixed-size table of search results keyed by GameState.hash.
+
+    Every slot has two tiers: a depth-preferred entry, which is only replaced
+    by a search at least as deep, and an always-replace entry that keeps the
+    most recent result pushed out of (or rejected by) the first tier.
+
+    Scores are stored from the AI's point of view, so a table must only be
+    shared between searches made for the same ai_color.
+    """
+
+    # Rough CPython footprint of one stored entry (tuple, hash int, score, move)
+    ENTRY_BYTES = 200
+
+    def __init__(self, max_megabytes=64):
+        """Allocate the table.
+
+        Args:
+            max_megabytes: Memory cap; the slot count is the largest power of
+                two whose two tiers fit in it
+        """
+        budget = max(1, int(max_megabytes * 1024 * 1024) // (2 * self.ENTRY_BYTES))
+        self.size = 1 << (budget.bit_length() - 1)
+        self.index_mask = self.size - 1
+        self.clear()
+
+    def clear(self):
+        """Drop every stored entry."""
+        self.deep = [None] * self.size
+        self.recent = [None] * self.size
+
+    def probe(self, key):
+        """Look up a position.
+
+        Returns:
+            tuple/None: (key, depth, score, flag, best_move) or None if absent
+        """
+        index = key & self.index_mask
+        entry = self.deep[index]
+        if entry is not None and entry[0] == key:
+            return entry
+        entry = self.recent[index]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    def store(self, key, depth, score, flag, best_move):
+        """Record a search result, keeping the deeper one in the first tier.
+
+        Args:
+            key: Position hash
+            depth: Remaining search depth the score was computed with
+            score: Search score
+            flag: EXACT, LOWER_BOUND or UPPER_BOUND
+            best_move: Best move found (used for move ordering)
+        """
+        index = key & self.index_mask
+        entry = (key, depth, score, flag, best_move)
+        deep = self.deep[index]
+        if deep is None or deep[0] == key or depth >= deep[1]:
+            if deep is not None and deep[0] != key:
+                self.recent[index] = deep
+            self.deep[index] = entry
+        else:
+            self.recent[index] = entry
+
+    def __len__(self):
+        return sum(entry is not None for entry in self.deep) + sum(entry is not None for entry in self.recent)
@@ -0,0 +1,12 @@
+"""Yonmoque-Hex game engine: state, rules and search, with no pygame dependency.
+
+The GUI (Screen.py) and any headless front end import the engine from here.
+BatchBoard needs NumPy and is imported on its own (engine.BatchBoard).
+"""
+from .GameState import GameState
+from .MonteCarlo import MCTSEngine, montecarlo
+from .MoveOrdering import MoveOrderer
+from .SearchStats import SearchStats
+from .Tablebase import Tablebase
+from .TranspositionTable import TranspositionTable
+from .minimax import ParallelMinimax, SearchContext, SearchTimeout, iterative_deepening, minimax
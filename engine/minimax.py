@@ -0,0 +1,405 @@
+import copy
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from .GameState import GameState
+from .MoveOrdering import MoveOrderer
+from .SearchStats import SearchStats
+from .Symmetry import canonical_key, from_canonical_move, to_canonical_move
+from .TranspositionTable import EXACT, LOWER_BOUND, UPPER_BOUND, TranspositionTable
+
+
+class SearchTimeout(Exception):
+    """Raised inside minimax when the search runs past its deadline or is stopped."""
+
+
+class SearchContext:
+    """Per-search state shared by every node of a minimax search."""
+
+    # Nodes between two clock (and stop event) reads when a deadline or stop event is set
+    CLOCK_CHECK_INTERVAL = 1024
+
+    def __init__(self, tt=None, deadline=None, orderer=None, stop_event=None, stats=None, symmetric_tt=False):
+        """
+        Args:
+            tt: Optional TranspositionTable
+            deadline: Optional time.perf_counter() value after which the search aborts
+            orderer: Optional MoveOrderer (killer and history tables)
+            stop_event: Optional threading.Event; the search aborts once it is set
+            stats: Optional SearchStats to count nodes, table hits and cutoffs in
+            symmetric_tt: Key the transposition table on Symmetry.canonical_key, so the
+                symmetric images of a position share one entry
+        """
+        self.tt = tt
+        self.deadline = deadline
+        self.orderer = orderer
+        self.stop_event = stop_event
+        self.stats = stats
+        self.symmetric_tt = symmetric_tt
+        self.nodes = 0
+        self.ply = 0  # distance from the root of the node being searched
+
+    @property
+    def interruptible(self):
+        """Whether check_deadline has anything to check."""
+        return self.deadline is not None or self.stop_event is not None
+
+    def check_deadline(self):
+        """Count a node and raise SearchTimeout once the deadline has passed or the search is stopped."""
+        self.nodes += 1
+        if self.nodes % self.CLOCK_CHECK_INTERVAL == 0:
+            if self.deadline is not None and time.perf_counter() > self.deadline:
+                raise SearchTimeout()
+            if self.stop_event is not None and self.stop_event.is_set():
+                raise SearchTimeout()
+
+
+def minimax(state, depth, alpha, beta, maximizing_player, last_play, ai_color, context=None):
+    """Minimax algorithm with alpha-beta pruning for adversarial search.
+
+        Args:
+            state: Current GameState object (explored in place and restored before returning)
+            depth: Search depth remaining
+            alpha: Alpha value for pruning
+            beta: Beta value for pruning
+            maximizing_player: True if current player is maximizing
+            last_play: Previous move made
+            ai_color: Color of the AI player ('black' or 'white')
+            context: Optional SearchContext (transposition table, deadline, move ordering, stats)
+
+        Returns:
+            tuple: (best_value, best_move) for current node
+        """
+
+    if context is not None and context.interruptible:
+        context.check_deadline()
+    stats = context.stats if context is not None else None
+    if stats is not None:
+        stats.nodes += 1
+
+    # Base case: depth limit or terminal state
+    if depth == 0 or state.is_game_over(last_play):
+        if stats is not None:
+            stats.leaf_evals += 1
+        # Calculate evaluation score using last play type
+        return state.evaluate_board(last_play, ai_color), None
+
+    alpha_orig, beta_orig = alpha, beta
+    tt = context.tt if context is not None else None
+    tt_move = None
+    if tt is not None:
+        if context.symmetric_tt:
+            tt_key, symmetry = canonical_key(state)
+        else:
+            tt_key, symmetry = state.hash, 0
+        entry = tt.probe(tt_key)
+        if stats is not None:
+            stats.tt_probes += 1
+        if entry is not None:
+            _, entry_depth, entry_score, entry_flag, tt_move = entry
+            if symmetry:
+                tt_move = from_canonical_move(tt_move, symmetry)
+            # Only trust scores searched to the same remaining depth, so the result
+            # does not depend on the order in which positions were visited
+            if entry_depth == depth and (entry_flag == EXACT or
+                                         (entry_flag == LOWER_BOUND and entry_score >= beta) or
+                                         (entry_flag == UPPER_BOUND and entry_score <= alpha)):
+                if stats is not None:
+                    stats.tt_hits += 1
+                return entry_score, tt_move
+
+    moves = state.get_valid_plays()
+    orderer = context.orderer if context is not None else None
+    if orderer is not None:
+        ply = context.ply
+        orderer.order(state, moves, ply, tt_move)
+    elif tt_move is not None and tt_move in moves:
+        # Try the best move from the stored search first
+        moves.remove(tt_move)
+        moves.insert(0, tt_move)
+
+    if context is not None:
+        context.ply += 1
+    best_move = None
+
+    if maximizing_player:
+        best_value = float('-inf')
+        for move in moves:
+            # Play the move in place (this also switches players)
+            undo_token = state.apply(move)
+
+            # Recursive call with the actual play as parameter
+            value, _ = minimax(state, depth - 1, alpha, beta, False, move, ai_color, context)
+            state.undo(undo_token)
+
+            if value > best_value:
+                best_value = value
+                best_move = move
+            alpha = max(alpha, best_value)
+            if beta <= alpha:
+                if orderer is not None:
+                    orderer.record_cutoff(move, ply, depth, state.current_player)
+                if stats is not None:
+                    stats.record_cutoff(context.ply - 1, move is moves[0])
+                break  # Alpha-beta pruning
+
+    else:  # Minimizing player
+        best_value = float('inf')
+        for move in moves:
+            undo_token = state.apply(move)
+            value, _ = minimax(state, depth - 1, alpha, beta, True, move, ai_color, context)
+            state.undo(undo_token)
+
+            if value < best_value:
+                best_value = value
+                best_move = move
+            beta = min(beta, best_value)
+            if beta <= alpha:
+                if orderer is not None:
+                    orderer.record_cutoff(move, ply, depth, state.current_player)
+                if stats is not None:
+                    stats.record_cutoff(context.ply - 1, move is moves[0])
+                break  # Alpha-beta pruning
+
+    if context is not None:
+        context.ply -= 1
+    if tt is not None:
+        if best_value <= alpha_orig:
+            flag = UPPER_BOUND
+        elif best_value >= beta_orig:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        tt.store(tt_key, depth, best_value, flag, to_canonical_move(best_move, symmetry) if symmetry else best_move)
+
+    return best_value, best_move
+
+
+def iterative_deepening(state, time_budget_ms, ai_color, max_depth=20, tt=None, on_iteration=None,
+                        parallel=None, stop_event=None, stats=None, symmetric_tt=False):
+    """Search depth 1, 2, ... until the time budget runs out.
+
+        The first iteration always completes so a move is always returned (unless
+        the search is stopped through stop_event, which can return no move). The
+        transposition table carries each iteration's best moves into the next
+        one, where they are searched first; killer and history tables persist
+        across iterations as well.
+
+        Args:
+            state: Current GameState object (left unchanged)
+            time_budget_ms: Wall-clock budget for the whole search in milliseconds
+            ai_color: Color of the AI player ('black' or 'white')
+            max_depth: Deepest iteration to run
+            tt: Optional TranspositionTable to reuse (a new one is made otherwise)
+            on_iteration: Optional callback(depth, value, move) after each completed iteration
+            parallel: Optional ParallelMinimax used for every iteration after the first
+            stop_event: Optional threading.Event to abort the search from another thread
+            stats: Optional SearchStats filled in with node counts per iteration, depth and elapsed time
+            symmetric_tt: Share transposition table entries between symmetric positions
+                (see SearchContext; the table must not be shared with non-symmetric searches)
+
+        Returns:
+            tuple: (best_value, best_move, depth) from the last completed iteration
+        """
+    started = time.perf_counter()
+    deadline = started + time_budget_ms / 1000
+    context = SearchContext(tt if tt is not None else TranspositionTable(), orderer=MoveOrderer(),
+                            stop_event=stop_event, stats=stats, symmetric_tt=symmetric_tt)
+    # An aborted iteration leaves its state mid-move, so never search the caller's state
+    search_state = state.copy_state()
+    best_value, best_move, completed_depth = None, None, 0
+
+    for depth in range(1, max_depth + 1):
+        context.ply = 0  # an aborted iteration does not unwind its ply counter
+        nodes_before = stats.nodes if stats is not None else 0
+        try:
+            if parallel is not None and depth > 1:
+                value, move = parallel.search(search_state, depth, ai_color, context.deadline, first_move=best_move,
+                                              stop_event=stop_event, stats=stats, symmetric_tt=symmetric_tt)
+            else:
+                value, move = minimax(search_state, depth, float('-inf'), float('inf'), True, None, ai_color, context)
+        except SearchTimeout:
+            break
+        best_value, best_move, completed_depth = value, move, depth
+        if stats is not None:
+            stats.iteration_nodes.append(stats.nodes - nodes_before)
+            stats.depth = depth
+        if on_iteration is not None:
+            on_iteration(depth, value, move)
+        if move is None:
+            break  # no legal moves or terminal position: deeper search changes nothing
+        context.deadline = deadline
+        if time.perf_counter() > deadline:
+            break
+
+    if stats is not None:
+        stats.elapsed += time.perf_counter() - started
+    return best_value, best_move, completed_depth
+
+
+# Per-process state of the ParallelMinimax workers, set up by _init_parallel_worker
+_worker = {}
+
+
+def _init_parallel_worker(alpha_value, alpha_index, lock, stop):
+    _worker.update(alpha_value=alpha_value, alpha_index=alpha_index, lock=lock, stop=stop,
+                   tt=TranspositionTable(), orderer=MoveOrderer(), tt_kind=None)
+
+
+def _publish_alpha(value, index):
+    """Share an exact root score if it beats the best so far (ties go to the earlier move)."""
+    with _worker["lock"]:
+        best_value, best_index = _worker["alpha_value"].value, _worker["alpha_index"].value
+        if value > best_value or (value == best_value and index < best_index):
+            _worker["alpha_value"].value = value
+            _worker["alpha_index"].value = index
+
+
+def _search_root_move(state, move, index, depth, ai_color, deadline, collect_stats=False, symmetric_tt=False):
+    """Worker task: search one root move against the best root score published so far.
+
+        Returns:
+            tuple: (index, value, exact, stats) where a non-exact value is only an upper bound
+            and stats is a SearchStats if collect_stats is set, else None
+        """
+    if _worker["tt_kind"] != (ai_color, symmetric_tt):
+        # Stored scores are from the previous AI color's point of view, or keyed the other way
+        _worker["tt"].clear()
+        _worker["tt_kind"] = (ai_color, symmetric_tt)
+
+    with _worker["lock"]:
+        best_value, best_index = _worker["alpha_value"].value, _worker["alpha_index"].value
+    # An earlier move only has to be tied to stay best, a later one has to beat it.
+    # Scores are integers, so "beat" is the same as "tie best_value - 1".
+    if best_index < index or best_value == float('-inf'):
+        alpha = best_value
+    else:
+        alpha = best_value - 1
+
+    stats = SearchStats() if collect_stats else None
+    context = SearchContext(_worker["tt"], deadline, _worker["orderer"], _worker["stop"], stats, symmetric_tt)
+    context.ply = 1
+    state.apply(move)
+    value, _ = minimax(state, depth - 1, alpha, float('inf'), False, move, ai_color, context)
+
+    exact = value > alpha or alpha == float('-inf')
+    if exact:
+        _publish_alpha(value, index)
+    return index, value, exact, stats
+
+
+class ParallelMinimax:
+    """Root-split minimax over a process pool.
+
+    The first root move is searched in this process to get an alpha bound, then
+    the other root moves are spread over the workers. Workers share the best
+    root score found so far and read it before each move, so later moves are
+    searched with the tightest window available.
+
+    The result is deterministic: like the serial minimax it is the first move,
+    in root order, with the highest score, whatever order the workers finish in.
+    """
+
+    def __init__(self, workers=None):
+        """
+        Args:
+            workers: Number of worker processes (defaults to the CPU count)
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.lock = multiprocessing.Lock()
+        self.alpha_value = multiprocessing.Value('d', float('-inf'), lock=False)
+        self.alpha_index = multiprocessing.Value('i', 0, lock=False)
+        # Set when a search is stopped, so the moves already running in the workers abort too
+        self.stop = multiprocessing.Event()
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_parallel_worker,
+            initargs=(self.alpha_value, self.alpha_index, self.lock, self.stop))
+        self.tt = TranspositionTable()
+        self.tt_kind = None  # (ai_color, symmetric_tt) of the searches self.tt holds
+
+    # Seconds between two stop event checks while waiting for the workers
+    STOP_POLL_INTERVAL = 0.05
+
+    def search(self, state, depth, ai_color, deadline=None, first_move=None, stop_event=None, stats=None,
+               symmetric_tt=False):
+        """Search the root moves of state in parallel.
+
+            Args:
+                state: Current GameState object (left unchanged)
+                depth: Search depth
+                ai_color: Color of the AI player, which is to move
+                deadline: Optional time.perf_counter() value; SearchTimeout is raised past it
+                first_move: Optional move to search first (e.g. the previous iteration's best)
+                stop_event: Optional threading.Event; SearchTimeout is raised once it is set
+                    (and the moves running in the workers are stopped as well)
+                stats: Optional SearchStats; the workers' counts are added to it as their moves finish
+                symmetric_tt: Key the transposition tables, here and in the workers, on Symmetry.canonical_key
+
+            Returns:
+                tuple: (best_value, best_move), as minimax would
+            """
+        if self.tt_kind != (ai_color, symmetric_tt):
+            self.tt.clear()
+            self.tt_kind = (ai_color, symmetric_tt)
+        self.stop.clear()
+        root = state.copy_state()
+        moves = root.get_valid_plays()
+        if depth == 0 or not moves or root.is_game_over(None):
+            return minimax(root, depth, float('-inf'), float('inf'), True, None, ai_color,
+                           SearchContext(self.tt, deadline, MoveOrderer(), stop_event, stats, symmetric_tt))
+
+        MoveOrderer().order(root, moves, 0, first_move)
+        if stats is not None:
+            stats.nodes += 1  # the root, searched move by move below
+
+        context = SearchContext(self.tt, deadline, MoveOrderer(), stop_event, stats, symmetric_tt)
+        context.ply = 1
+        undo_token = root.apply(moves[0])
+        best_value, _ = minimax(root, depth - 1, float('-inf'), float('inf'), False, moves[0], ai_color, context)
+        root.undo(undo_token)
+        best_index = 0
+
+        with self.lock:
+            self.alpha_value.value = best_value
+            self.alpha_index.value = 0
+
+        futures = [self.executor.submit(_search_root_move, root, move, index, depth, ai_color, deadline,
+                                        stats is not None, symmetric_tt)
+                   for index, move in enumerate(moves[1:], 1)]
+        try:
+            for future in futures:
+                if stop_event is not None:
+                    while not future.done():
+                        if stop_event.wait(self.STOP_POLL_INTERVAL):
+                            raise SearchTimeout()
+                index, value, exact, worker_stats = future.result()
+                if stats is not None:
+                    stats.merge(worker_stats)
+                if exact and (value > best_value or (value == best_value and index < best_index)):
+                    best_value, best_index = value, index
+        except SearchTimeout:
+            self.stop.set()
+            for future in futures:
+                future.cancel()
+            raise
+
+        return best_value, moves[best_index]
+
+    def close(self, wait=True):
+        """Shut the worker processes down.
+
+            Args:
+                wait: Wait for the workers to exit; otherwise queued moves are dropped, running
+                    ones are stopped, and the workers exit in the background
+            """
+        if not wait:
+            self.stop.set()
+        self.executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -1,6 +1,10 @@
-from Screen import screen, home_screen
 import pygame
 
-pygame.init()
-main_screen = home_screen()
-pygame.quit()
\ No newline at end of file
+if __name__ == "__main__":
+    # Imported here, not at the top: on Windows and macOS the worker processes of the
+    # parallel searches re-run this file, and importing Screen opens the game window
+    from Screen import home_screen
+
+    pygame.init()
+    home_screen()
+    pygame.quit()
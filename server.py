@@ -0,0 +1,273 @@
+"""Headless move server: JSON lines over a local TCP socket.
+
+Run with `python server.py [--host 127.0.0.1] [--port 8765] [--workers N]`.
+
+Every line a client sends is one JSON request, and every line sent back is
+one reply carrying the request's "id". Requests are served concurrently, so a
+single connection can multiplex any number of games. Searches run in a
+process pool, each bounded by its own time budget.
+
+Requests:
+    {"id": 1, "op": "move", "position": {...}, "engine": "minimax", "time_ms": 1000}
+    {"id": 2, "op": "cancel", "target": 1}
+    {"id": 3, "op": "ping"}
+
+    "position" uses the format of GameState.to_dict, e.g.
+    {"black": [[3, 3]], "white": [], "reserve": {"black": 5, "white": 6}, "to_move": "white"}
+    and an optional "options" object is passed on to the engine:
+        minimax:    "max_depth"
+        montecarlo: "num_simulations", "rollout_depth", "rollout_policy", "tree"
+
+Replies:
+    {"id": 1, "move": ["place", [2, 3]], "value": 25, "depth": 4}
+    {"id": 1, "move": ["move", [2, 3], [2, 5]]}
+    {"id": 1, "error": "cancelled"}
+    {"id": 2, "error": "nothing to cancel: 1"}
+    {"id": 3, "pong": true}
+
+Ids are strings, integers or null. A move request whose id is still pending
+on the connection is refused, so every running search stays cancellable.
+
+A cancelled request that is still queued never runs. One that is already
+running is told to stop through its stop event, frees its worker within
+about STOP_POLL_INTERVAL, and its result is dropped. A malformed request gets
+a "bad request" error reply like any other failure.
+"""
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from engine import GameState, iterative_deepening, montecarlo
+
+DEFAULT_TIME_MS = 1000
+MAX_TIME_MS = 60000
+ENGINES = ("minimax", "montecarlo")
+# Seconds between two reads of a request's stop event in the worker (each read is a call to the manager process)
+STOP_POLL_INTERVAL = 0.02
+
+
+def move_to_json(move):
+    """("move", (x, y), (x, y)) -> ["move", [x, y], [x, y]]"""
+    if move is None:
+        return None
+    return [move[0]] + [list(tile) for tile in move[1:]]
+
+
+def is_valid_id(value):
+    """Whether value can be a request id (or a cancel target): a string, an integer or None."""
+    return value is None or (isinstance(value, (str, int)) and not isinstance(value, bool))
+
+
+def validate_request(request):
+    """Check the shape of a move request before it is sent to a worker.
+
+    Returns:
+        tuple: (position, engine, time_ms, options)
+
+    Raises:
+        ValueError: If a field is missing or has the wrong type
+    """
+    position = request.get("position")
+    if not isinstance(position, dict):
+        raise ValueError("position must be an object")
+    engine = request.get("engine", "minimax")
+    if engine not in ENGINES:
+        raise ValueError(f"unknown engine: {engine}")
+    time_ms = request.get("time_ms", DEFAULT_TIME_MS)
+    if not isinstance(time_ms, (int, float)) or isinstance(time_ms, bool):
+        raise ValueError("time_ms must be a number")
+    if not math.isfinite(time_ms) or time_ms < 0:
+        raise ValueError("time_ms must be finite and not negative")
+    options = request.get("options", {})
+    if not isinstance(options, dict):
+        raise ValueError("options must be an object")
+    return position, engine, min(int(time_ms), MAX_TIME_MS), options
+
+
+class PolledEvent:
+    """Read-only view of a manager Event that asks the manager at most every STOP_POLL_INTERVAL.
+
+    The engines check their stop event once per node batch or per simulation,
+    far more often than a round trip to the manager process should be paid.
+    """
+
+    def __init__(self, event):
+        self.event = event
+        self.stopped = False
+        self.next_poll = 0.0
+
+    def is_set(self):
+        if not self.stopped and time.perf_counter() >= self.next_poll:
+            self.stopped = self.event.is_set()
+            self.next_poll = time.perf_counter() + STOP_POLL_INTERVAL
+        return self.stopped
+
+
+def search_position(position, engine, time_ms, options, stop_event=None):
+    """Worker task: best move for a position.
+
+    Args:
+        position: Position in the GameState.to_dict format
+        engine: "minimax" or "montecarlo"
+        time_ms: Time budget in milliseconds
+        options: Engine options (see the module docstring)
+        stop_event: Optional manager Event; the search returns early once it is set
+
+    Returns:
+        dict: Reply fields ("move", plus "value" and "depth" for minimax)
+    """
+    state = GameState.from_dict(position)
+    ai_color = state.current_player
+    if stop_event is not None:
+        stop_event = PolledEvent(stop_event)
+    if engine == "minimax":
+        value, move, depth = iterative_deepening(
+            state, time_ms, ai_color, max_depth=options.get("max_depth", 20), stop_event=stop_event)
+        return {"move": move_to_json(move), "value": value, "depth": depth}
+    if engine == "montecarlo":
+        move = montecarlo(
+            state,
+            num_simulations=options.get("num_simulations", 1000000),
+            rollout_depth=options.get("rollout_depth", 8),
+            ai_color=ai_color,
+            rollout_policy=options.get("rollout_policy", "winblock"),
+            tree=options.get("tree", "array"),
+            time_budget_ms=time_ms,
+            stop_event=stop_event,
+        )
+        return {"move": move_to_json(move)}
+    raise ValueError(f"Unknown engine: {engine}")
+
+
+class MoveServer:
+    """Serves move requests from any number of connections over one process pool."""
+
+    def __init__(self, workers=None):
+        """
+        Args:
+            workers: Number of search processes (defaults to the CPU count)
+        """
+        self.executor = ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1)
+        # Hands out the per-request stop events, which unlike threading or plain
+        # multiprocessing events can be sent to pool workers with a task
+        self.manager = multiprocessing.Manager()
+
+    async def handle_connection(self, reader, writer):
+        """Read requests line by line and answer each one as soon as it is done."""
+        pending = {}  # request id -> asyncio task
+        stops = {}  # request id -> stop event of its search
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("request must be a JSON object")
+                    if not is_valid_id(request.get("id")):
+                        raise ValueError("id must be a string, an integer or null")
+                except ValueError as error:
+                    await self.send(writer, {"id": None, "error": f"bad request: {error}"})
+                    continue
+
+                request_id = request.get("id")
+                op = request.get("op", "move")
+                if op == "ping":
+                    await self.send(writer, {"id": request_id, "pong": True})
+                elif op == "cancel":
+                    target = request.get("target")
+                    if not is_valid_id(target):
+                        await self.send(writer, {"id": request_id,
+                                                 "error": "bad request: target must be a string, an integer or null"})
+                        continue
+                    task = pending.pop(target, None)
+                    stop = stops.pop(target, None)
+                    if stop is not None:
+                        stop.set()
+                    if task is not None and task.cancel():
+                        await self.send(writer, {"id": target, "error": "cancelled"})
+                    else:
+                        await self.send(writer, {"id": request_id,
+                                                 "error": f"nothing to cancel: {json.dumps(target)}"})
+                elif op == "move":
+                    if request_id in pending:
+                        await self.send(writer, {"id": request_id, "error": "bad request: id already pending"})
+                        continue
+                    stop = stops[request_id] = self.manager.Event()
+                    task = asyncio.ensure_future(self.answer(writer, request, stop))
+                    pending[request_id] = task
+
+                    def forget(done, key=request_id, task=task):
+                        if pending.get(key) is task:
+                            del pending[key]
+                            stops.pop(key, None)
+
+                    task.add_done_callback(forget)
+                else:
+                    await self.send(writer, {"id": request_id, "error": f"unknown op: {op}"})
+        finally:
+            for stop in stops.values():
+                stop.set()
+            for task in list(pending.values()):
+                task.cancel()
+            writer.close()
+
+    async def answer(self, writer, request, stop_event=None):
+        """Run one search in the pool and send its reply (an error reply if anything fails)."""
+        request_id = request.get("id")
+        try:
+            position, engine, time_ms, options = validate_request(request)
+        except ValueError as error:
+            await self.send(writer, {"id": request_id, "error": f"bad request: {error}"})
+            return
+        try:
+            loop = asyncio.get_event_loop()
+            reply = await loop.run_in_executor(
+                self.executor, search_position, position, engine, time_ms, options, stop_event)
+            reply["id"] = request_id
+        except (KeyError, TypeError, ValueError, AttributeError) as error:
+            reply = {"id": request_id, "error": f"bad request: {error!r}"}
+        except Exception as error:
+            reply = {"id": request_id, "error": f"search failed: {error!r}"}
+        await self.send(writer, reply)
+
+    @staticmethod
+    async def send(writer, reply):
+        if writer.is_closing():
+            return
+        writer.write((json.dumps(reply) + "\n").encode())
+        await writer.drain()
+
+    def close(self):
+        self.executor.shutdown()
+        self.manager.shutdown()
+
+
+async def serve(host, port, workers=None):
+    """Start a MoveServer and serve until cancelled."""
+    move_server = MoveServer(workers)
+    server = await asyncio.start_server(move_server.handle_connection, host, port)
+    print(f"Move server listening on {host}:{port}", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        move_server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Yonmoque-Hex move server (JSON lines over TCP)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None, help="search processes (default: CPU count)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers))
+    except KeyboardInterrupt:
+        pass
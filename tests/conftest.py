@@ -0,0 +1,39 @@
+import os
+import random
+import sys
+
+import pytest
+
+# Tests import the engine from the repository root, as the GUI and the scripts do
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import GameState  # noqa: E402
+
+PLAYOUTS = 60
+MAX_PLIES = 80
+
+
+def random_playout(rng):
+    """Positions of one random game as (state copy, last play) pairs, the start included."""
+    state = GameState()
+    positions = [(state.copy_state(), None)]
+    for _ in range(MAX_PLIES):
+        plays = state.get_valid_plays()
+        if not plays:
+            break
+        play = rng.choice(plays)
+        state.apply(play)
+        positions.append((state.copy_state(), play))
+        if state.is_game_over(play):
+            break
+    return positions
+
+
+@pytest.fixture(scope="session")
+def playout_positions():
+    """Every position of a fixed set of random games, as (state, last play) pairs."""
+    rng = random.Random(2024)
+    positions = []
+    for _ in range(PLAYOUTS):
+        positions.extend(random_playout(rng))
+    return positions
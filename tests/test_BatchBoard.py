@@ -0,0 +1,21 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+from engine import BatchBoard  # noqa: E402
+
+
+def test_legal_moves_match_gamestate(playout_positions):
+    states = [state for state, _ in playout_positions]
+    placements, moves = BatchBoard.legal_move_masks(*BatchBoard.encode_states(states))
+    for row, state in enumerate(states):
+        assert BatchBoard.decode_moves(placements[row], moves[row]) == state.get_valid_plays()
+
+
+def test_evaluation_matches_gamestate(playout_positions):
+    states = [state for state, _ in playout_positions]
+    plays = [play for _, play in playout_positions]
+    boards, reserves, _ = BatchBoard.encode_states(states)
+    destinations = BatchBoard.encode_plays(plays)
+    for ai_color in ("black", "white"):
+        scores = BatchBoard.evaluate_boards(boards, reserves, destinations, ai_color)
+        assert scores.tolist() == [state.evaluate_board(play, ai_color) for state, play in playout_positions]
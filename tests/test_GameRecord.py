@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from engine import GameState
+from engine.GameRecord import MOVE_TABLES, decode_game, encode_game, read_games, write_games
+from conftest import random_playout
+
+
+def random_games(count, seed):
+    rng = random.Random(seed)
+    games = []
+    for _ in range(count):
+        positions = random_playout(rng)
+        games.append(([play for _, play in positions[1:]], rng.choice(["black", "white", None])))
+    return games
+
+
+def test_move_tables_fit_in_a_byte():
+    assert all(len(table) <= 256 for table in MOVE_TABLES.values())
+
+
+def test_encode_decode_round_trip():
+    for moves, _ in random_games(50, 1):
+        data = encode_game(moves)
+        assert len(data) == len(moves)
+        assert decode_game(data) == moves
+
+
+def test_write_read_round_trip(tmp_path):
+    path = tmp_path / "games.ymgr"
+    games = random_games(30, 2)
+    assert write_games(path, games[:10]) == 10
+    assert write_games(path, games[10:]) == 20
+    assert list(read_games(path)) == games
+
+
+def test_recorded_games_replay_legally(tmp_path):
+    path = tmp_path / "games.ymgr"
+    write_games(path, random_games(10, 3))
+    for moves, _ in read_games(path):
+        state = GameState()
+        for move in moves:
+            assert move in state.get_valid_plays()
+            state.apply(move)
+
+
+@pytest.mark.parametrize("tail", [b"\x05", b"\x05\x00\x01", b"\x05\x00\x01\x00\x02"])
+def test_truncated_final_frame(tmp_path, tail):
+    path = tmp_path / "games.ymgr"
+    first, second, third = random_games(3, 4)
+    write_games(path, [first])
+    with open(path, "ab") as record_file:
+        record_file.write(tail)  # an append interrupted part way through a frame
+    assert list(read_games(path)) == [first]
+
+    write_games(path, [second, third])
+    assert list(read_games(path)) == [first, second, third]
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not a record")
+    with pytest.raises(ValueError):
+        list(read_games(path))
+    with pytest.raises(ValueError):
+        write_games(path, [])
+    assert path.read_bytes() == b"not a record"
@@ -0,0 +1,96 @@
+import random
+
+from engine import GameState
+from engine.BoardGeometry import iter_tiles
+
+TRACKED_FIELDS = ("masks", "occupied_mask", "reserve", "current_player", "hash", "align_points", "align_total",
+                  "strong_pieces", "ray_mobility", "mobility")
+
+
+def snapshot(state):
+    return {field: repr(getattr(state, field)) for field in TRACKED_FIELDS}
+
+
+def legal_plays(state, color):
+    """get_valid_plays for color, whoever is to move."""
+    view = state.copy_state()
+    view.current_player = color
+    return view.get_valid_plays()
+
+
+def rescanned_evaluation(state, play, ai_color):
+    """evaluate_board computed from scratch, as it was before its terms were kept incrementally."""
+    ai_opponent = "black" if ai_color == "white" else "white"
+    if state.check_lose() is not None:
+        return -10000
+    if play and play[0] == "move":
+        winner = state.check_win(play)
+        if winner == ai_color:
+            return 9000
+        if winner == ai_opponent:
+            return -9000
+
+    score = 0
+    for tile in iter_tiles(state.masks[ai_opponent]):
+        if state.count_alignment(tile, ai_opponent) >= 3:
+            score -= 1000
+    for tile in iter_tiles(state.masks[ai_color]):
+        score += state.count_alignment(tile, ai_color) * 10
+    for tile in iter_tiles(state.masks[ai_opponent]):
+        score -= state.count_alignment(tile, ai_opponent) * 15
+    score += (len(legal_plays(state, ai_color)) - len(legal_plays(state, ai_opponent))) * 5
+    return score
+
+
+def test_evaluate_board_matches_rescan(playout_positions):
+    for state, play in playout_positions:
+        for ai_color in ("black", "white"):
+            assert state.evaluate_board(play, ai_color) == rescanned_evaluation(state, play, ai_color)
+
+
+def test_incremental_terms_match_rescan(playout_positions):
+    for state, _ in playout_positions:
+        for color in ("black", "white"):
+            points = [state.count_alignment(tile, color) for tile in iter_tiles(state.masks[color])]
+            assert state.align_total[color] == sum(points)
+            assert state.strong_pieces[color] == sum(point >= 3 for point in points)
+            assert state.mobility[color] == sum(play[0] == "move" for play in legal_plays(state, color))
+
+
+def test_hash_matches_compute_hash(playout_positions):
+    for state, _ in playout_positions:
+        assert state.hash == state.compute_hash()
+
+
+def test_apply_undo_restores_state():
+    rng = random.Random(7)
+    for _ in range(20):
+        state = GameState()
+        for _ in range(60):
+            plays = state.get_valid_plays()
+            if not plays:
+                break
+            before = snapshot(state)
+            for play in plays:
+                undo_token = state.apply(play)
+                assert state.hash == state.compute_hash()
+                state.undo(undo_token)
+                assert snapshot(state) == before
+            play = rng.choice(plays)
+            state.apply(play)
+            if state.is_game_over(play):
+                break
+
+
+def test_apply_matches_copying_moves(playout_positions):
+    for state, _ in playout_positions[:400]:
+        for play in state.get_valid_plays():
+            if play[0] == "place":
+                copied = state.place_piece(play[1], state.current_player)
+            else:
+                copied = state.make_move(play)
+            copied.current_player = "white" if state.current_player == "black" else "black"
+            applied = state.copy_state()
+            applied.apply(play)
+            assert applied.to_dict() == copied.to_dict()
+            assert applied.hash == copied.hash
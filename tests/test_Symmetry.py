@@ -0,0 +1,20 @@
+from engine.Symmetry import SYMMETRIES, canonical_key, canonical_state, transform_move, transform_state
+
+
+def test_symmetric_images_share_a_canonical_key(playout_positions):
+    for state, _ in playout_positions:
+        key, symmetry = canonical_key(state)
+        assert key == canonical_state(state)[0].hash
+        for s in range(len(SYMMETRIES)):
+            assert canonical_key(transform_state(state, s))[0] == key
+
+
+def test_transforms_commute_with_the_rules(playout_positions):
+    for state, play in playout_positions:
+        for s in range(1, len(SYMMETRIES)):
+            image = transform_state(state, s)
+            assert sorted(image.get_valid_plays()) == sorted(transform_move(move, s)
+                                                             for move in state.get_valid_plays())
+            assert image.is_game_over(transform_move(play, s)) == state.is_game_over(play)
+            for ai_color in ("black", "white"):
+                assert image.evaluate_board(transform_move(play, s), ai_color) == state.evaluate_board(play, ai_color)
@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+from engine import GameState, Tablebase
+from engine.BoardGeometry import iter_tiles
+from engine.Tablebase import DRAW, LOSS, WIN, _loser, _positions, position_index, successors
+
+PIECES = 3
+
+
+@pytest.fixture(scope="module")
+def table():
+    return Tablebase.generate(PIECES)
+
+
+def position_state(black, white, white_to_move):
+    return GameState.from_dict({"black": [list(tile) for tile in iter_tiles(black)],
+                                "white": [list(tile) for tile in iter_tiles(white)],
+                                "reserve": {"black": 0, "white": 0},
+                                "to_move": "white" if white_to_move else "black"})
+
+
+def stored_result(table, black, white, white_to_move):
+    """Tablebase.probe on bitboards, without building a GameState."""
+    value = table.values[position_index(black, white, white_to_move, PIECES)]
+    if not value:
+        return DRAW, None
+    return (WIN if value & 1 else LOSS), (value + 1) // 2
+
+
+def test_probe_reads_the_table(table):
+    rng = random.Random(4)
+    for black, white, white_to_move in rng.sample(list(_positions(PIECES)), 500):
+        if not _loser(black, white):
+            assert (table.probe(position_state(black, white, white_to_move))
+                    == stored_result(table, black, white, white_to_move))
+
+
+def test_index_enumerates_every_position():
+    positions = list(_positions(PIECES))
+    assert [position_index(black, white, white_to_move, PIECES)
+            for black, white, white_to_move in positions] == list(range(len(positions)))
+
+
+def test_successors_follow_the_rules():
+    rng = random.Random(3)
+    for black, white, white_to_move in rng.sample(list(_positions(PIECES)), 500):
+        if _loser(black, white):
+            continue
+        state = position_state(black, white, white_to_move)
+        player = state.current_player
+        expected = {}
+        for move in state.get_valid_plays():
+            undo_token = state.apply(move)
+            outcome = None
+            if state.is_game_over(move):
+                outcome = LOSS if state.check_lose() == player else WIN
+            expected[move] = (state.masks["black"], state.masks["white"], outcome)
+            state.undo(undo_token)
+        assert {move: (new_black, new_white, outcome)
+                for move, new_black, new_white, outcome in successors(black, white, white_to_move)} == expected
+
+
+def test_values_agree_with_successors(table):
+    for black, white, white_to_move in _positions(PIECES):
+        if _loser(black, white):
+            continue
+        results = []
+        for _, new_black, new_white, outcome in successors(black, white, white_to_move):
+            if outcome is not None:
+                results.append((outcome, 1))
+            else:
+                child, distance = stored_result(table, new_black, new_white, not white_to_move)
+                results.append(({WIN: LOSS, LOSS: WIN, DRAW: DRAW}[child], distance and distance + 1))
+        wins = [distance for outcome, distance in results if outcome == WIN]
+        if wins:
+            expected = (WIN, min(wins))
+        elif any(outcome == DRAW for outcome, _ in results) or not results:
+            expected = (DRAW, None)
+        else:
+            expected = (LOSS, max(distance for _, distance in results))
+        assert stored_result(table, black, white, white_to_move) == expected
+
+
+def test_save_and_load(table, tmp_path):
+    path = str(tmp_path / "table.tb")
+    table.save(path)
+    loaded = Tablebase.load(path)
+    assert loaded.pieces == PIECES
+    assert bytes(loaded.values) == bytes(table.values)